@@ -1,16 +1,16 @@
 # app.py
 import streamlit as st
-from PIL import Image
 from utils.ai_utils import get_gemini_response
 from utils.firebase_utils import (
     init_firebase,
-    upload_image_to_storage,
-    save_artisan_data,
+    save_artisan_with_image,
+)
+from utils.image_utils import (
+    generate_enhanced_image,
+    compute_image_key,
 )
-from utils.image_utils import generate_enhanced_image
 from utils.gcp_ai_utils import transcribe_audio, translate_text, get_image_labels
 from st_audiorec import st_audiorec
-from io import BytesIO
 from utils.gdrive_utils import (
     get_gdrive_flow,
     get_gdrive_service_from_session,
@@ -87,54 +87,7 @@ def scroll_to_top():
 
 def render_scroll_to_top_button():
     """Render fixed scroll to top button"""
-    st.markdown(
-        """
-        <div id="scroll-to-top-container">
-            <button class="scroll-to-top-btn" id="scrollToTopBtn" onclick="scrollToTop()">
-                <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round">
-                    <polyline points="18,15 12,9 6,15"></polyline>
-                </svg>
-            </button>
-        </div>
-
-        <script>
-        function scrollToTop() {
-            const mainElement = window.parent.document.querySelector('.main');
-            if (mainElement) {
-                mainElement.scrollTo({ top: 0, behavior: 'smooth' });
-            }
-            window.parent.document.documentElement.scrollTo({ top: 0, behavior: 'smooth' });
-            window.parent.document.body.scrollTo({ top: 0, behavior: 'smooth' });
-        }
-
-        function toggleScrollButton() {
-            const scrollBtn = document.getElementById('scrollToTopBtn');
-            if (!scrollBtn) return;
-            
-            const mainElement = window.parent.document.querySelector('.main');
-            const scrollTop = mainElement ? mainElement.scrollTop : 
-                             (window.parent.document.documentElement.scrollTop || window.parent.document.body.scrollTop);
-            
-            if (scrollTop > 300) {
-                scrollBtn.classList.add('visible');
-            } else {
-                scrollBtn.classList.remove('visible');
-            }
-        }
-
-        // Set up scroll listener
-        setTimeout(function() {
-            const mainElement = window.parent.document.querySelector('.main');
-            if (mainElement) {
-                mainElement.addEventListener('scroll', toggleScrollButton);
-            }
-            window.parent.addEventListener('scroll', toggleScrollButton);
-            toggleScrollButton(); // Initial check
-        }, 500);
-        </script>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(_SCROLL_TO_TOP_BUTTON, unsafe_allow_html=True)
 
 
 # ==================== CONFIGURATION ====================
@@ -149,9 +102,7 @@ st.set_page_config(
 
 
 # ==================== CUSTOM CSS STYLING ====================
-def load_custom_css():
-    st.markdown(
-        """
+_CUSTOM_CSS = """
     <style>
     /* Import Google Fonts for better typography */
     @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&display=swap');
@@ -355,15 +306,7 @@ def load_custom_css():
         font-size: 1.2rem;
         font-weight: bold;
         transition: var(--transition);
-        opacity: 0;
-        visibility: hidden;
-        transform: translateY(20px);
-    }
-    
-    .scroll-to-top-btn.visible {
-        opacity: 1;
-        visibility: visible;
-        transform: translateY(0);
+        text-decoration: none;
     }
     
     .scroll-to-top-btn:hover {
@@ -477,6 +420,13 @@ def load_custom_css():
         box-shadow: var(--neon-glow);
     }
     
+    /* Style cards on the enhancement page */
+    .style-card-grid {
+        display: grid;
+        grid-template-columns: repeat(3, 1fr);
+        gap: 1rem;
+    }
+    
     /* Enhanced Buttons */
     .stButton > button {
         background: var(--bg-gradient);
@@ -593,6 +543,21 @@ def load_custom_css():
         color: white;
     }
     
+    /* Sidebar navigation states (containers keyed nav_<state>_<step>) */
+    section[data-testid="stSidebar"] [class*="st-key-nav_current_"] .stButton > button {
+        background: var(--primary) !important;
+        color: white !important;
+        border: 2px solid var(--primary-light) !important;
+        box-shadow: var(--neon-glow) !important;
+        transform: translateX(5px) !important;
+    }
+    
+    section[data-testid="stSidebar"] [class*="st-key-nav_completed_"] .stButton > button {
+        background: var(--success) !important;
+        color: white !important;
+        border: 1px solid var(--success-dark) !important;
+    }
+    
     /* File Uploader Enhancement */
     .stFileUploader > div {
         border-radius: 10px;
@@ -645,6 +610,10 @@ def load_custom_css():
             width: 60px;
         }
         
+        .style-card-grid {
+            grid-template-columns: 1fr;
+        }
+        
         .logo-image {
             max-width: 140px;
         }
@@ -724,9 +693,104 @@ def load_custom_css():
     }
 
     </style>
-    """,
-        unsafe_allow_html=True,
-    )
+    """
+
+
+def load_custom_css():
+    st.markdown(_CUSTOM_CSS, unsafe_allow_html=True)
+
+
+# ==================== STATIC HTML ====================
+# Pre-rendered once at import; none of these depend on session state.
+_STYLE_CARD_TEMPLATE = """
+<div class="feature-card" style="text-align: center; min-height: 180px; cursor: pointer;">
+    <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">{icon}</div>
+    <h4 style="color: var(--primary); margin: 0.5rem 0;">{title}</h4>
+    <p style="font-size: 0.85rem; color: var(--text-secondary); margin: 0.5rem 0;">{desc}</p>
+</div>
+"""
+
+_STYLE_CARD_VIBRANT = _STYLE_CARD_TEMPLATE.format(
+    icon="🎨",
+    title="Vibrant",
+    desc="Enhanced colors and contrast for eye-catching appeal",
+)
+_STYLE_CARD_STUDIO = _STYLE_CARD_TEMPLATE.format(
+    icon="📸",
+    title="Studio",
+    desc="Professional studio lighting with clean background",
+)
+_STYLE_CARD_FESTIVE = _STYLE_CARD_TEMPLATE.format(
+    icon="✨",
+    title="Festive",
+    desc="Warm, celebratory atmosphere perfect for occasions",
+)
+
+# Plain anchor link back to _TOP_ANCHOR; no script needed (and st.markdown
+# does not execute <script> tags anyway)
+_TOP_ANCHOR = '<div id="top-anchor"></div>'
+
+_SCROLL_TO_TOP_BUTTON = """
+<div id="scroll-to-top-container">
+    <a class="scroll-to-top-btn" href="#top-anchor" title="Back to top">
+        <svg width="20" height="20" viewBox="0 0 24 24" fill="none" stroke="currentColor" stroke-width="2.5" stroke-linecap="round" stroke-linejoin="round">
+            <polyline points="18,15 12,9 6,15"></polyline>
+        </svg>
+    </a>
+</div>
+"""
+
+_STYLE_NAMES = ("Vibrant", "Studio", "Festive")
+
+# All three cards in one element; the Apply buttons sit in columns below
+_STYLE_CARDS_GRID = (
+    '<div class="style-card-grid">'
+    + _STYLE_CARD_VIBRANT
+    + _STYLE_CARD_STUDIO
+    + _STYLE_CARD_FESTIVE
+    + "</div>"
+)
+
+_PACKAGE_INCLUDES_CARD = """
+<div class="feature-card neon">
+    <h4 style="margin-top: 0;">✅ Package Includes:</h4>
+    <ul style="list-style: none; padding-left: 0;">
+        <li>✨ AI-Enhanced product image</li>
+        <li>📝 Professional product description</li>
+        <li>💬 Ready-to-use social media captions</li>
+        <li>🏷️ Trending hashtags for visibility</li>
+        <li>📊 Complete product details</li>
+    </ul>
+</div>
+"""
+
+_WELCOME_CARD = """
+<div style="max-width: 600px; margin: 2rem auto; text-align: center;">
+    <h3 style="color: var(--text-primary); margin-bottom: 2rem;">
+        Empower Your Craft with AI
+    </h3>
+    <div class="feature-card neon" style="text-align: left; margin: 2rem 0;">
+        <h4>Welcome, Artisan! 👋</h4>
+        <p>Transform your handmade products into professional marketing materials:</p>
+        <ul style="text-align: left; margin-top: 1rem;">
+            <li>📸 AI-enhanced product photography</li>
+            <li>✏️ Professional product descriptions</li>
+            <li>📱 Social media ready content</li>
+            <li>🏷️ Smart hashtag generation</li>
+            <li>☁️ Google Drive integration</li>
+        </ul>
+    </div>
+</div>
+"""
+
+
+# (label, page, step, session key that must be set for the step to be enabled)
+_NAV_STEPS = (
+    ("📋 Step 1: Details", "Onboarding", 1, None),
+    ("✏️ Step 2: Content", "Content", 2, "product_image_bytes"),
+    ("🎨 Step 3: Enhance", "Image", 3, "generated_content"),
+    ("📤 Step 4: Export", "Export", 4, "enhanced_image_bytes"),
+)
 
 
 def render_logo():
@@ -799,10 +863,12 @@ class SessionState:
                 "dimensions": "",
                 "tags": [],
             },
-            "product_image": None,
+            "product_image_bytes": None,
+            "product_image_key": None,
             "uploaded_file_name": "",
             "generated_content": None,
-            "enhanced_image": None,
+            "enhanced_image_bytes": None,
+            "enhanced_cache": {},
             "transcribed_text": None,
             "suggested_tags": None,
             "current_step": 1,
@@ -829,6 +895,21 @@ def change_page(page_name, step_number):
     st.session_state.should_scroll_to_top = True
 
 
+def get_content_segments(content):
+    """Build the display pieces of the generated content"""
+    captions = content.get("social_media_captions", [])
+    return {
+        "description_html": f"""
+            <div class="feature-card" style="background: var(--bg-tertiary);">
+                {content.get('product_description', 'Not available.')}
+            </div>
+            """,
+        "captions": captions,
+        "tab_labels": [f"📱 Caption {i+1}" for i in range(len(captions))],
+        "hashtag_text": " ".join(f"{tag}" for tag in content.get("hashtags", [])),
+    }
+
+
 def render_progress_indicator():
     """Render horizontal progress indicator"""
     steps = [
@@ -1021,14 +1102,18 @@ def render_onboarding_page():
 
         if uploaded_file:
             if (
-                st.session_state.product_image is None
+                st.session_state.product_image_bytes is None
                 or uploaded_file.name != st.session_state.uploaded_file_name
             ):
                 # Read the bytes of the uploaded file first
                 image_bytes = uploaded_file.getvalue()
 
-                # Open the image from bytes for display and other non-cached uses
-                st.session_state.product_image = Image.open(BytesIO(image_bytes))
+                # Only the encoded bytes are kept; nothing needs the decoded image
+                image_key = compute_image_key(image_bytes)
+                st.session_state.product_image_bytes = image_bytes
+                st.session_state.product_image_key = image_key
+                # Enhanced results of the previous product are no longer reachable
+                st.session_state.enhanced_cache = {}
                 st.session_state.uploaded_file_name = uploaded_file.name
 
                 with st.spinner("🔍 Analyzing image with AI..."):
@@ -1037,9 +1122,9 @@ def render_onboarding_page():
                     time.sleep(0.5)
 
     with col_img2:
-        if st.session_state.product_image:
+        if st.session_state.product_image_bytes:
             st.image(
-                st.session_state.product_image,
+                st.session_state.product_image_bytes,
                 use_container_width=True,
                 caption="Your Product",
             )
@@ -1063,11 +1148,12 @@ def render_onboarding_page():
             "💾 Save & Continue to Content →",
             type="primary",
             use_container_width=True,
-            disabled=not (data["craft_type"] and st.session_state.product_image),
+            disabled=not (data["craft_type"] and st.session_state.product_image_bytes),
         ):
             if validate_onboarding_data():
                 with st.spinner("Saving your information..."):
-                    save_onboarding_data()
+                    saved = save_onboarding_data()
+                if saved:
                     st.success("✅ Information saved successfully!")
                     time.sleep(1)
                     change_page("Content", 2)
@@ -1082,9 +1168,9 @@ def render_content_page():
     col_detail1, col_detail2 = st.columns([1, 2])
 
     with col_detail1:
-        if st.session_state.product_image:
+        if st.session_state.product_image_bytes:
             st.image(
-                st.session_state.product_image,
+                st.session_state.product_image_bytes,
                 use_container_width=True,
                 caption="Your Product",
             )
@@ -1113,19 +1199,12 @@ def render_content_page():
             type="primary",
             use_container_width=True,
         ):
+            # ✅ Pass the original upload bytes; no re-encode needed
             with st.spinner("🤖 AI is creating compelling content..."):
-                progress_bar = st.progress(0)
-                for i in range(100):
-                    time.sleep(0.02)
-                    progress_bar.progress(i + 1)
-
-                # ✅ Convert the PIL image to bytes before passing to the cached function
-                buffered = BytesIO()
-                st.session_state.product_image.save(buffered, format="PNG")
-                image_bytes = buffered.getvalue()
-
                 st.session_state.generated_content = get_gemini_response(
-                    image_bytes, st.session_state.artisan_data
+                    st.session_state.product_image_bytes,
+                    st.session_state.artisan_data,
+                    image_key=st.session_state.product_image_key,
                 )
 
                 if st.session_state.generated_content:
@@ -1138,24 +1217,17 @@ def render_content_page():
     if st.session_state.generated_content:
         st.markdown("### 📱 Generated Marketing Content")
 
-        content = st.session_state.generated_content
+        segments = get_content_segments(st.session_state.generated_content)
 
         # Enhanced Product Description
         st.markdown("#### 📝 Enhanced Product Description")
-        st.markdown(
-            f"""
-            <div class="feature-card" style="background: var(--bg-tertiary);">
-                {content.get('product_description', 'Not available.')}
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(segments["description_html"], unsafe_allow_html=True)
 
         # Social Media Captions with increased height
         st.markdown("#### 💬 Social Media Captions")
-        captions = content.get("social_media_captions", [])
+        captions = segments["captions"]
         if captions:
-            tabs = st.tabs([f"📱 Caption {i+1}" for i in range(len(captions))])
+            tabs = st.tabs(segments["tab_labels"])
             for i, (tab, caption) in enumerate(zip(tabs, captions)):
                 with tab:
                     st.text_area(
@@ -1167,11 +1239,9 @@ def render_content_page():
                     )
 
         # Hashtags
-        hashtags = content.get("hashtags", [])
-        if hashtags:
+        if segments["hashtag_text"]:
             st.markdown("#### #️⃣ Trending Hashtags")
-            hashtag_text = " ".join(f"{tag}" for tag in hashtags)
-            st.code(hashtag_text, language=None)
+            st.code(segments["hashtag_text"], language=None)
 
         # Continue Button
         st.markdown("---")
@@ -1197,42 +1267,13 @@ def render_image_page():
     st.info("✨ Choose a style to transform your product image with AI magic")
 
     # Style Selection with better cards
+    st.markdown(_STYLE_CARDS_GRID, unsafe_allow_html=True)
     cols = st.columns(3)
-    styles = [
-        (
-            "🎨",
-            "Vibrant",
-            "Enhanced colors and contrast for eye-catching appeal",
-            "Vibrant",
-        ),
-        (
-            "📸",
-            "Studio",
-            "Professional studio lighting with clean background",
-            "Studio",
-        ),
-        (
-            "✨",
-            "Festive",
-            "Warm, celebratory atmosphere perfect for occasions",
-            "Festive",
-        ),
-    ]
 
-    for col, (icon, title, desc, style_name) in zip(cols, styles):
+    for col, style_name in zip(cols, _STYLE_NAMES):
         with col:
-            st.markdown(
-                f"""
-                <div class="feature-card" style="text-align: center; min-height: 180px; cursor: pointer;">
-                    <div style="font-size: 2.5rem; margin-bottom: 0.5rem;">{icon}</div>
-                    <h4 style="color: var(--primary); margin: 0.5rem 0;">{title}</h4>
-                    <p style="font-size: 0.85rem; color: var(--text-secondary); margin: 0.5rem 0;">{desc}</p>
-                </div>
-                """,
-                unsafe_allow_html=True,
-            )
             if st.button(
-                f"Apply {title} Style",
+                f"Apply {style_name} Style",
                 use_container_width=True,
                 key=style_name.lower(),
             ):
@@ -1246,26 +1287,23 @@ def render_image_page():
 
     with col_img1:
         st.markdown("#### 📷 Original Image")
-        if st.session_state.product_image:
-            st.image(st.session_state.product_image, use_container_width=True)
+        if st.session_state.product_image_bytes:
+            st.image(st.session_state.product_image_bytes, use_container_width=True)
         else:
             st.info("No image uploaded")
 
     with col_img2:
         st.markdown("#### ✨ Enhanced Image")
-        if st.session_state.enhanced_image:
-            st.image(st.session_state.enhanced_image, use_container_width=True)
+        if st.session_state.enhanced_image_bytes:
+            st.image(st.session_state.enhanced_image_bytes, use_container_width=True)
 
             # Download and Continue
             st.markdown("---")
-            buffered = BytesIO()
-            st.session_state.enhanced_image.save(buffered, format="PNG")
-
             col_d1, col_d2 = st.columns(2)
             with col_d1:
                 st.download_button(
                     label="⬇️ Download Enhanced",
-                    data=buffered.getvalue(),
+                    data=st.session_state.enhanced_image_bytes,
                     file_name=f"enhanced_{st.session_state.artisan_data['craft_type'].replace(' ', '_')}.png",
                     mime="image/png",
                     use_container_width=True,
@@ -1303,21 +1341,7 @@ def render_export_page():
 
     with col1:
         # Package Contents
-        st.markdown(
-            """
-            <div class="feature-card neon">
-                <h4 style="margin-top: 0;">✅ Package Includes:</h4>
-                <ul style="list-style: none; padding-left: 0;">
-                    <li>✨ AI-Enhanced product image</li>
-                    <li>📝 Professional product description</li>
-                    <li>💬 Ready-to-use social media captions</li>
-                    <li>🏷️ Trending hashtags for visibility</li>
-                    <li>📊 Complete product details</li>
-                </ul>
-            </div>
-            """,
-            unsafe_allow_html=True,
-        )
+        st.markdown(_PACKAGE_INCLUDES_CARD, unsafe_allow_html=True)
 
         # Quick Stats
         if st.session_state.generated_content:
@@ -1337,9 +1361,9 @@ def render_export_page():
 
     with col2:
         # Final Image Preview
-        if st.session_state.enhanced_image:
+        if st.session_state.enhanced_image_bytes:
             st.markdown("#### 🖼️ Your Enhanced Product Image")
-            st.image(st.session_state.enhanced_image, use_container_width=True)
+            st.image(st.session_state.enhanced_image_bytes, use_container_width=True)
 
     # Export Section
     st.markdown("---")
@@ -1381,43 +1405,51 @@ def validate_onboarding_data():
     if not data["craft_type"]:
         st.error("❌ Please enter your craft type")
         return False
-    if not st.session_state.product_image:
+    if not st.session_state.product_image_bytes:
         st.error("❌ Please upload a product image")
         return False
     return True
 
 
-def save_onboarding_data():
-    """Save onboarding data to Firebase"""
+def save_onboarding_data() -> bool:
+    """Save onboarding data to Firebase; returns whether the save worked"""
     data = st.session_state.artisan_data.copy()
     data["name"] = st.session_state.user_profile["name"]
     data["user_email"] = st.session_state.user_profile["email"]
 
-    buffered = BytesIO()
-    st.session_state.product_image.save(buffered, format="JPEG")
-    image_url = upload_image_to_storage(
-        buffered.getvalue(), st.session_state.uploaded_file_name
+    # The original upload bytes are stored as-is, in parallel with the
+    # Firestore write
+    saved = save_artisan_with_image(
+        st.session_state.product_image_bytes,
+        st.session_state.uploaded_file_name,
+        data,
     )
-    data["product_image_url"] = image_url
-
-    save_artisan_data(data)
+    if saved is None:
+        st.error("❌ Failed to save your product details. Please try again.")
+        return False
+    return True
 
 
 def enhance_image(style):
     """Enhance image with selected style"""
+    # Re-clicking a style already applied to this image is a dict lookup
+    cache_key = (st.session_state.product_image_key, style)
+    enhanced_bytes = st.session_state.enhanced_cache.get(cache_key)
+
     with st.spinner(f"🎨 Applying {style} style with AI magic..."):
-        progress_bar = st.progress(0)
-        for i in range(100):
-            time.sleep(0.01)
-            progress_bar.progress(i + 1)
-
-        # ✅ Convert the PIL image to bytes before passing to the cached function
-        buffered = BytesIO()
-        st.session_state.product_image.save(buffered, format="PNG")
-        image_bytes = buffered.getvalue()
-
-        st.session_state.enhanced_image = generate_enhanced_image(image_bytes, style)
-        if st.session_state.enhanced_image:
+        if enhanced_bytes is None:
+            enhanced_bytes = generate_enhanced_image(
+                st.session_state.product_image_key,
+                style,
+                st.session_state.product_image_bytes,
+            )
+            if enhanced_bytes:
+                st.session_state.enhanced_cache[cache_key] = enhanced_bytes
+
+        # Only the encoded bytes are kept; st.image, the download button and
+        # the Drive export all consume them without decoding
+        st.session_state.enhanced_image_bytes = enhanced_bytes
+        if st.session_state.enhanced_image_bytes:
             st.success(f"✨ {style} style applied successfully!")
             time.sleep(0.5)
             st.rerun()
@@ -1427,51 +1459,70 @@ def enhance_image(style):
 
 def export_to_drive():
     """Export marketing pack to Google Drive"""
-    if not st.session_state.enhanced_image or not st.session_state.generated_content:
+    if (
+        not st.session_state.enhanced_image_bytes
+        or not st.session_state.generated_content
+    ):
         st.error("❌ Please complete all steps before exporting")
         return
 
     with st.spinner("☁️ Uploading to Google Drive..."):
-        progress_bar = st.progress(0)
-        for i in range(100):
-            time.sleep(0.01)
-            progress_bar.progress(i + 1)
+        progress_bar = st.progress(0, text="Connecting to Google Drive...")
 
         service = get_gdrive_service_from_session()
         content = st.session_state.generated_content
 
-        export_text = f"""
-# KalaKarigar.ai Marketing Pack
-Generated for: {st.session_state.user_profile['name']}
-Product: {st.session_state.artisan_data['craft_type']}
-Date: {time.strftime('%Y-%m-%d %H:%M')}
-
----
-
-## Enhanced Product Description
-{content.get('product_description', 'N/A')}
-
-## Social Media Captions
-### Caption 1:
-{content.get('social_media_captions', ['N/A'])[0]}
-
-### Caption 2:
-{content.get('social_media_captions', ['N/A', 'N/A'])[1] if len(content.get('social_media_captions', [])) > 1 else 'N/A'}
-
-## Hashtags
-{' '.join('#' + tag for tag in content.get('hashtags', []))}
+        artisan = st.session_state.artisan_data
+        craft = artisan["craft_type"]
+        user = st.session_state.user_profile
+        captions = content.get("social_media_captions") or ["N/A"]
+        # Gemini usually returns tags with the leading '#' already
+        hashtag_line = " ".join(
+            tag if tag.startswith("#") else "#" + tag
+            for tag in content.get("hashtags", [])
+        )
 
-## Product Details
-- Materials: {st.session_state.artisan_data.get('materials', 'N/A')}
-- Dimensions: {st.session_state.artisan_data.get('dimensions', 'N/A')}
-- Tags: {', '.join(st.session_state.artisan_data.get('tags', []))}
-"""
+        # One timestamp for both the document date and the folder name
+        now = datetime.now()
+
+        export_text = "\n".join(
+            [
+                "",
+                "# KalaKarigar.ai Marketing Pack",
+                f"Generated for: {user['name']}",
+                f"Product: {craft}",
+                f"Date: {now:%Y-%m-%d %H:%M}",
+                "",
+                "---",
+                "",
+                "## Enhanced Product Description",
+                content.get("product_description", "N/A"),
+                "",
+                "## Social Media Captions",
+                "### Caption 1:",
+                captions[0],
+                "",
+                "### Caption 2:",
+                captions[1] if len(captions) > 1 else "N/A",
+                "",
+                "## Hashtags",
+                hashtag_line,
+                "",
+                "## Product Details",
+                f"- Materials: {artisan.get('materials', 'N/A')}",
+                f"- Dimensions: {artisan.get('dimensions', 'N/A')}",
+                f"- Tags: {', '.join(artisan.get('tags', []))}",
+                "",
+            ]
+        )
 
-        folder_name = f"KalaKarigar_{st.session_state.artisan_data['craft_type']}_{time.strftime('%Y%m%d_%H%M%S')}"
+        folder_name = f"KalaKarigar_{craft}_{now:%Y%m%d_%H%M%S}"
 
+        progress_bar.progress(20, text="Uploading your marketing pack...")
         folder_link = export_marketing_pack(
-            service, st.session_state.enhanced_image, export_text, folder_name
+            service, st.session_state.enhanced_image_bytes, export_text, folder_name
         )
+        progress_bar.progress(100, text="Done!")
 
         # ✅ Check if the folder_link is valid before showing success
         if folder_link:
@@ -1495,21 +1546,27 @@ Date: {time.strftime('%Y-%m-%d %H:%M')}
 
 def reset_project_state():
     """Reset project-specific state for new project"""
-    st.session_state.artisan_data = {
-        "craft_type": "",
-        "description": "",
-        "materials": "",
-        "dimensions": "",
-        "tags": [],
-    }
-    st.session_state.product_image = None
-    st.session_state.uploaded_file_name = ""
-    st.session_state.generated_content = None
-    st.session_state.enhanced_image = None
-    st.session_state.transcribed_text = None
-    st.session_state.suggested_tags = None
-    st.session_state.current_step = 1
-    st.session_state.steps_completed = []
+    st.session_state.update(
+        {
+            "artisan_data": {
+                "craft_type": "",
+                "description": "",
+                "materials": "",
+                "dimensions": "",
+                "tags": [],
+            },
+            "product_image_bytes": None,
+            "product_image_key": None,
+            "uploaded_file_name": "",
+            "generated_content": None,
+            "enhanced_image_bytes": None,
+            "enhanced_cache": {},
+            "transcribed_text": None,
+            "suggested_tags": None,
+            "current_step": 1,
+            "steps_completed": [],
+        }
+    )
 
 
 # ==================== MAIN APPLICATION ====================
@@ -1533,7 +1590,7 @@ def main():
             with st.spinner("🔐 Authenticating..."):
                 flow.fetch_token(code=auth_code)
                 creds = flow.credentials
-                st.session_state.gdrive_credentials = {
+                gdrive_credentials = {
                     "token": creds.token,
                     "refresh_token": creds.refresh_token,
                     "token_uri": creds.token_uri,
@@ -1541,10 +1598,11 @@ def main():
                     "client_secret": creds.client_secret,
                     "scopes": creds.scopes,
                 }
-                # Get user profile
-                st.session_state.user_profile = get_user_info()
+                st.session_state.gdrive_credentials = gdrive_credentials
 
-                # Save to URL for persistence
+                # The fresh ID token is only read here, never persisted, so a
+                # token restored from the URL cannot supply the profile
+                st.session_state.user_profile = get_user_info(creds.id_token)
                 save_credentials_to_url()
 
                 # Clear the auth code but keep session
@@ -1563,38 +1621,15 @@ def main():
             with st.spinner("Loading your profile..."):
                 st.session_state.user_profile = get_user_info()
                 save_credentials_to_url()  # Update URL with profile
-                st.rerun()
 
         render_main_app()
 
 
 def render_login_page(flow):
     """Render the login page"""
-    load_custom_css()
-
     render_logo()
 
-    st.markdown(
-        """
-        <div style="max-width: 600px; margin: 2rem auto; text-align: center;">
-            <h3 style="color: var(--text-primary); margin-bottom: 2rem;">
-                Empower Your Craft with AI
-            </h3>
-            <div class="feature-card neon" style="text-align: left; margin: 2rem 0;">
-                <h4>Welcome, Artisan! 👋</h4>
-                <p>Transform your handmade products into professional marketing materials:</p>
-                <ul style="text-align: left; margin-top: 1rem;">
-                    <li>📸 AI-enhanced product photography</li>
-                    <li>✏️ Professional product descriptions</li>
-                    <li>📱 Social media ready content</li>
-                    <li>🏷️ Smart hashtag generation</li>
-                    <li>☁️ Google Drive integration</li>
-                </ul>
-            </div>
-        </div>
-        """,
-        unsafe_allow_html=True,
-    )
+    st.markdown(_WELCOME_CARD, unsafe_allow_html=True)
 
     col1, col2, col3 = st.columns([1, 2, 1])
     with col2:
@@ -1620,6 +1655,7 @@ def render_main_app():
         scroll_to_top()
         st.session_state.should_scroll_to_top = False
 
+    st.markdown(_TOP_ANCHOR, unsafe_allow_html=True)
     render_header()
     render_progress_indicator()
 
@@ -1635,83 +1671,39 @@ def render_main_app():
             unsafe_allow_html=True,
         )
 
-        nav_buttons = [
-            ("📋 Step 1: Details", "Onboarding", 1, True),
-            (
-                "✏️ Step 2: Content",
-                "Content",
-                2,
-                st.session_state.product_image is not None,
-            ),
-            (
-                "🎨 Step 3: Enhance",
-                "Image",
-                3,
-                st.session_state.generated_content is not None,
-            ),
-            (
-                "📤 Step 4: Export",
-                "Export",
-                4,
-                st.session_state.enhanced_image is not None,
-            ),
-        ]
-
-        for label, page, step, enabled in nav_buttons:
-            # Determine button state and styling
+        for label, page, step, required_key in _NAV_STEPS:
+            # Determine button state
             is_current = st.session_state.page == page
             is_completed = step in st.session_state.steps_completed
+            enabled = required_key is None or (
+                st.session_state.get(required_key) is not None
+            )
 
-            # Custom styling based on state
+            # Add completion indicator to label and pick the styling state;
+            # the container key becomes an st-key-nav_<state>_<step> class
+            # that the static sidebar rules in _CUSTOM_CSS match on
             if is_current:
-                # Current step - highlighted
-                st.markdown(
-                    f"""
-                <style>
-                .stButton > button[key="nav_{page}_{step}"] {{
-                    background: var(--primary) !important;
-                    color: white !important;
-                    border: 2px solid var(--primary-light) !important;
-                    box-shadow: var(--neon-glow) !important;
-                    transform: translateX(5px) !important;
-                }}
-                </style>
-                """,
-                    unsafe_allow_html=True,
-                )
+                label = f"▶️ {label}"
+                nav_state = "current"
             elif is_completed:
-                # Completed step - success styling
-                st.markdown(
-                    f"""
-                <style>
-                .stButton > button[key="nav_{page}_{step}"] {{
-                    background: var(--success) !important;
-                    color: white !important;
-                    border: 1px solid var(--success-dark) !important;
-                }}
-                </style>
-                """,
-                    unsafe_allow_html=True,
-                )
-
-            # Add completion indicator to label
-            if is_completed and not is_current:
                 label = f"✅ {label}"
-            elif is_current:
-                label = f"▶️ {label}"
+                nav_state = "completed"
+            else:
+                nav_state = "pending"
 
             button_type = "primary" if is_current else "secondary"
 
-            if st.button(
-                label,
-                use_container_width=True,
-                disabled=not enabled,
-                type=button_type,
-                key=f"nav_{page}_{step}",
-            ):
-                change_page(page, step)
-                time.sleep(0.05)
-                st.rerun()
+            with st.container(key=f"nav_{nav_state}_{step}"):
+                if st.button(
+                    label,
+                    use_container_width=True,
+                    disabled=not enabled,
+                    type=button_type,
+                    key=f"nav_{page}_{step}",
+                ):
+                    change_page(page, step)
+                    time.sleep(0.05)
+                    st.rerun()
 
     # Page Content Rendering
     if st.session_state.page == "Onboarding":
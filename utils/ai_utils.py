@@ -1,11 +1,19 @@
 # utils/ai_utils.py
+import ast
+import copy
 import streamlit as st
 import google.generativeai as genai
-from PIL import Image
-import json
+import hashlib
 import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Optional, List, Any
-from io import BytesIO
+
+import orjson
+from pydantic import BaseModel, ConfigDict, ValidationError, field_validator
+
+from utils.cache_utils import ResponseCache
+from utils.image_utils import infer_image_mime, shrink_for_api
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -16,24 +24,79 @@ MODEL_NAME = "gemini-2.5-flash"
 MAX_DESCRIPTION_LENGTH = 120
 DEFAULT_CAPTION_COUNT = 2
 DEFAULT_HASHTAG_COUNT = 15
+MAX_CONCURRENT_REQUESTS = 8  # Gemini calls in flight during batch generation
+RESPONSE_CACHE_SIZE = 2048
+RESPONSE_CACHE_TTL = 3600  # seconds
+
+_PROMPT_TEMPLATE = """You are an expert e-commerce marketing assistant for Indian artisan {name}. 
+Create a complete marketing kit based on the image and artisan's details.
+
+**Product Details:**
+- Craft Type: {craft_type}
+- Description: {description}
+- Materials: {materials}
+- AI Tags: {tags}
+
+Generate JSON with exactly these keys: "product_description", "social_media_captions", "hashtags"
+
+Requirements:
+1. **product_description**: Professional 80-100 word description incorporating relevant AI tags
+2. **social_media_captions**: Array of {caption_count} engaging, varied captions
+3. **hashtags**: Array of {hashtag_count} relevant hashtags including AI tags
+
+Ensure JSON is valid and complete."""
+
+_JSON_RE = re.compile(r"\{.*\}", re.S)
+_TRAILING_COMMA_RE = re.compile(r",\s*([}\]])")
+
+
+class MarketingKit(BaseModel):
+    """Schema of the marketing content Gemini is asked to return."""
+
+    model_config = ConfigDict(extra="allow")
+
+    product_description: str
+    social_media_captions: List[str]
+    hashtags: List[str]
+
+    @field_validator("social_media_captions", mode="before")
+    @classmethod
+    def _wrap_caption(cls, value: Any) -> Any:
+        return [str(value)] if not isinstance(value, list) else value
+
+    @field_validator("hashtags", mode="before")
+    @classmethod
+    def _split_hashtags(cls, value: Any) -> Any:
+        return str(value).split() if not isinstance(value, list) else value
+
+
+def _image_part(image_bytes: bytes) -> Dict[str, Any]:
+    """Wrap encoded image bytes as a Gemini inline data part, downscaled if large."""
+    image_bytes = shrink_for_api(image_bytes)
+    return {"mime_type": infer_image_mime(image_bytes), "data": image_bytes}
+
+
+@st.cache_resource(show_spinner=False)
+def get_gemini_model() -> genai.GenerativeModel:
+    """
+    Get the Gemini model shared across sessions and reruns.
+
+    The returned model is a cached resource: callers must not mutate it.
+    """
+    try:
+        return genai.GenerativeModel(MODEL_NAME)
+    except Exception as e:
+        logger.error(f"Failed to initialize Gemini model: {e}")
+        raise
 
 
 class ContentGenerator:
     """Handles AI content generation for marketing materials."""
 
-    def __init__(self):
-        self._model = None
-
     @property
-    def model(self):
-        """Lazy load the Gemini model."""
-        if self._model is None:
-            try:
-                self._model = genai.GenerativeModel(MODEL_NAME)
-            except Exception as e:
-                logger.error(f"Failed to initialize Gemini model: {e}")
-                raise
-        return self._model
+    def model(self) -> genai.GenerativeModel:
+        """Get the shared Gemini model."""
+        return get_gemini_model()
 
     def _build_prompt(self, craft_details: Dict[str, Any]) -> str:
         """Build optimized prompt for content generation."""
@@ -45,63 +108,89 @@ class ContentGenerator:
 
         tags_str = ", ".join(tags) if tags else "N/A"
 
-        return f"""You are an expert e-commerce marketing assistant for Indian artisan {name}. 
-Create a complete marketing kit based on the image and artisan's details.
-
-**Product Details:**
-- Craft Type: {craft_type}
-- Description: {description}
-- Materials: {materials}
-- AI Tags: {tags_str}
-
-Generate JSON with exactly these keys: "product_description", "social_media_captions", "hashtags"
-
-Requirements:
-1. **product_description**: Professional 80-100 word description incorporating relevant AI tags
-2. **social_media_captions**: Array of {DEFAULT_CAPTION_COUNT} engaging, varied captions
-3. **hashtags**: Array of {DEFAULT_HASHTAG_COUNT} relevant hashtags including AI tags
-
-Ensure JSON is valid and complete."""
+        return _PROMPT_TEMPLATE.format(
+            name=name,
+            craft_type=craft_type,
+            description=description,
+            materials=materials,
+            tags=tags_str,
+            caption_count=DEFAULT_CAPTION_COUNT,
+            hashtag_count=DEFAULT_HASHTAG_COUNT,
+        )
 
     def _parse_response(self, response_text: str) -> Optional[Dict[str, Any]]:
         """Parse and validate AI response."""
         try:
-            # Clean response
-            cleaned = response_text.strip()
-
-            # Remove common markdown formatting
-            for marker in ["```json", "```", "`"]:
-                cleaned = cleaned.replace(marker, "")
+            # Locate the outermost JSON object, skipping any markdown fences
+            match = _JSON_RE.search(response_text)
+            if match is None:
+                logger.warning("No JSON object found in response")
+                return None
 
-            # Parse JSON
-            content = json.loads(cleaned)
+            # Parse and validate in one pass; on failure, recover the JSON
+            # leniently and validate the recovered object
+            span = match.group(0)
+            try:
+                return MarketingKit.model_validate_json(span).model_dump()
+            except ValidationError as e:
+                logger.warning(f"Response failed strict validation: {e}")
 
-            # Validate structure
-            required_keys = ["product_description", "social_media_captions", "hashtags"]
-            if not all(key in content for key in required_keys):
-                logger.warning(
-                    f"Missing required keys in response: {list(content.keys())}"
-                )
+            content = self._load_json(span)
+            if content is None:
                 return None
+            return MarketingKit.model_validate(content).model_dump()
+
+        except ValidationError as e:
+            logger.warning(f"Invalid response structure: {e}")
+            return None
+        except Exception as e:
+            logger.error(f"Response parsing error: {e}")
+            return None
 
-            # Validate types
-            if not isinstance(content["social_media_captions"], list):
-                content["social_media_captions"] = [
-                    str(content["social_media_captions"])
-                ]
+    @staticmethod
+    def _load_json(text: str) -> Any:
+        """
+        Parse model JSON, trying progressively more lenient parsers.
 
-            if not isinstance(content["hashtags"], list):
-                content["hashtags"] = str(content["hashtags"]).split()
+        Tiers: strict JSON, JSON with trailing commas removed, then a Python
+        literal (single quotes, True/False/None). Returns None if all fail.
+        """
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError as e:
+            logger.warning(f"Strict JSON parsing failed: {e}")
 
+        try:
+            content = orjson.loads(_TRAILING_COMMA_RE.sub(r"\1", text))
+            logger.info("Recovered response JSON after removing trailing commas")
             return content
+        except orjson.JSONDecodeError:
+            pass
 
-        except json.JSONDecodeError as e:
+        try:
+            content = ast.literal_eval(text)
+            logger.info("Recovered response JSON as a Python literal")
+            return content
+        except (ValueError, SyntaxError) as e:
             logger.error(f"JSON parsing error: {e}")
             return None
-        except Exception as e:
-            logger.error(f"Response parsing error: {e}")
+
+    def _process_response(self, response: Any) -> Optional[Dict[str, Any]]:
+        """Turn a Gemini response into content, or None if it is unusable."""
+        if not response or not response.text:
+            logger.error("Empty response from Gemini")
             return None
 
+        # Parse response
+        content = self._parse_response(response.text)
+
+        if content is None:
+            logger.warning("Using fallback content due to parsing failure")
+            return None
+
+        logger.info("Successfully generated marketing content")
+        return content
+
     def _create_fallback_content(self, craft_details: Dict[str, Any]) -> Dict[str, Any]:
         """Create fallback content if AI generation fails."""
         craft_type = craft_details.get("craft_type", "Handmade Product")
@@ -130,23 +219,44 @@ Ensure JSON is valid and complete."""
         }
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+@st.cache_resource
+def get_response_cache() -> ResponseCache:
+    """Get the response cache shared across sessions."""
+    return ResponseCache(RESPONSE_CACHE_SIZE, RESPONSE_CACHE_TTL)
+
+
+def _cache_key(image_key: str, craft_details: Dict[str, Any]) -> str:
+    """Build a cache key from the image content hash and the craft details."""
+    hasher = hashlib.blake2b(image_key.encode(), digest_size=16)
+    hasher.update(orjson.dumps(craft_details, option=orjson.OPT_SORT_KEYS))
+    return hasher.hexdigest()
+
+
 def get_gemini_response(
-    image_bytes: bytes, craft_details: Dict[str, Any]
+    image_bytes: bytes,
+    craft_details: Dict[str, Any],
+    image_key: Optional[str] = None,
 ) -> Optional[Dict[str, Any]]:
     """
     Generate marketing content from image and craft details.
 
     Args:
-        image: PIL Image object of the product
+        image_bytes: Encoded product image
         craft_details: Dictionary with craft information
+        image_key: Content hash of image_bytes, computed if not given
 
     Returns:
         Dictionary with generated content or None if error occurs
     """
+    if image_key is None:
+        image_key = hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
 
-    # ✅ Convert the input bytes back to a PIL Image object
-    image = Image.open(BytesIO(image_bytes))
+    cache = get_response_cache()
+    key = _cache_key(image_key, craft_details)
+    cached = cache.get(key)
+    if cached is not None:
+        logger.info(f"Content cache hit ({cache.stats()})")
+        return copy.deepcopy(cached)
 
     generator = ContentGenerator()
 
@@ -154,30 +264,81 @@ def get_gemini_response(
         # Build prompt
         prompt = generator._build_prompt(craft_details)
 
-        # Generate content
+        # Generate content, sending the upload's encoded bytes as-is
         with st.spinner("Generating content..."):
-            response = generator.model.generate_content([prompt, image])
+            response = generator.model.generate_content(
+                [prompt, _image_part(image_bytes)]
+            )
 
-        if not response or not response.text:
-            logger.error("Empty response from Gemini")
+        content = generator._process_response(response)
+        if content is None:
+            # Fallbacks are not cached, so the next request tries Gemini again
             return generator._create_fallback_content(craft_details)
 
-        # Parse response
-        content = generator._parse_response(response.text)
+        cache.set(key, content)
+        return copy.deepcopy(content)
+
+    except Exception as e:
+        logger.error(f"Content generation error: {e}")
+        st.error(f"Content generation failed: {e}")
+        return generator._create_fallback_content(craft_details)
+
 
+def _generate_content_sync(
+    generator: ContentGenerator,
+    image_part: Dict[str, Any],
+    craft_details: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Generate content for one product on a worker thread."""
+    try:
+        prompt = generator._build_prompt(craft_details)
+        response = generator.model.generate_content([prompt, image_part])
+        content = generator._process_response(response)
         if content is None:
-            logger.warning("Using fallback content due to parsing failure")
             return generator._create_fallback_content(craft_details)
-
-        logger.info("Successfully generated marketing content")
         return content
-
     except Exception as e:
         logger.error(f"Content generation error: {e}")
-        st.error(f"Content generation failed: {e}")
         return generator._create_fallback_content(craft_details)
 
 
+def get_gemini_responses_batch(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Generate marketing content for several products concurrently.
+
+    Args:
+        items: List of dicts with "image_bytes" and "craft_details" keys
+
+    Returns:
+        List of content dictionaries, in the same order as items
+    """
+    if not items:
+        return []
+
+    # One generator (and model handle) shared across the whole batch
+    generator = ContentGenerator()
+
+    # Image parts use the Streamlit cache, so build them on the script thread
+    image_parts = [_image_part(item["image_bytes"]) for item in items]
+
+    with st.spinner(f"Generating content for {len(items)} products..."):
+        with ThreadPoolExecutor(
+            max_workers=min(MAX_CONCURRENT_REQUESTS, len(items))
+        ) as executor:
+            results = list(
+                executor.map(
+                    lambda part, item: _generate_content_sync(
+                        generator, part, item["craft_details"]
+                    ),
+                    image_parts,
+                    items,
+                )
+            )
+
+    logger.info(f"Batch content generation finished: {len(results)} products")
+    return results
+
+
 def validate_generated_content(content: Dict[str, Any]) -> bool:
     """Validate the structure and quality of generated content."""
     if not isinstance(content, dict):
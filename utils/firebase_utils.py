@@ -1,18 +1,52 @@
 # utils/firebase_utils.py
-import json
 import os
 import streamlit as st
 import firebase_admin
-from firebase_admin import credentials, firestore, storage
-from uuid import uuid4
+from firebase_admin import credentials, firestore
+from google.auth.transport.requests import AuthorizedSession
+from google.cloud import storage as gcs
+from google.cloud.storage.retry import DEFAULT_RETRY
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+import hashlib
 import logging
-from typing import Dict, Any, Optional, Tuple
+from typing import Dict, Any, List, Optional, Tuple, Union, BinaryIO
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from io import BytesIO
+from urllib.parse import unquote, urlparse
+
+import orjson
+
+from utils.image_utils import infer_image_mime
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Constants
+HTTP_POOL_SIZE = 32  # Keep-alive connections for Storage requests
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # Larger uploads go resumable in chunks
+FIRESTORE_BATCH_LIMIT = 500  # Max writes per Firestore batch commit
+ARTISAN_REQUIRED_FIELDS = ["name", "craft_type", "description"]
+
+
+@st.cache_resource
+def get_firebase_credentials() -> credentials.Certificate:
+    """Parse the service account key once per process and build credentials."""
+    # Check for the environment variable first (for Cloud Run)
+    creds_json_str = os.getenv("FIREBASE_CREDENTIALS")
+    if creds_json_str:
+        creds_dict = orjson.loads(creds_json_str)
+    else:
+        # Fallback to secrets.toml for local development
+        creds_dict = dict(st.secrets["firebase_credentials"])
+
+    if "\\n" in creds_dict["private_key"]:
+        creds_dict["private_key"] = creds_dict["private_key"].replace("\\n", "\n")
+
+    return credentials.Certificate(creds_dict)
+
 
 class FirebaseManager:
     """Centralized Firebase operations manager."""
@@ -37,37 +71,39 @@ class FirebaseManager:
         return self._db
 
     @property
-    def bucket(self) -> storage.bucket:
+    def bucket(self) -> gcs.Bucket:
         """Get Storage bucket with lazy initialization."""
         if self._bucket is None:
-            self._bucket = storage.bucket()
+            self._bucket = self._create_bucket()
         return self._bucket
 
+    def _create_bucket(self) -> gcs.Bucket:
+        """Create the Storage bucket on a pooled keep-alive HTTP session."""
+        credential = self.app.credential.get_credential()
+        session = AuthorizedSession(credential)
+        session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=HTTP_POOL_SIZE,
+                pool_maxsize=HTTP_POOL_SIZE,
+                max_retries=Retry(total=3, backoff_factor=0.3),
+            ),
+        )
+        client = gcs.Client(
+            project=self.app.project_id, credentials=credential, _http=session
+        )
+        return client.bucket(self.app.options.get("storageBucket"))
+
     def _initialize_app(self) -> Optional[firebase_admin.App]:
         """Initialize Firebase Admin SDK."""
         try:
             if firebase_admin._apps:
                 return firebase_admin.get_app()
 
-            # --- THIS IS THE FIX ---
-            # Check for the environment variable first (for Cloud Run)
-            creds_json_str = os.getenv("FIREBASE_CREDENTIALS")
-            if creds_json_str:
-                creds_dict = json.loads(creds_json_str)
-            else:
-                # Fallback to secrets.toml for local development
-                creds_dict = dict(st.secrets["firebase_credentials"])
-            # --- END FIX ---
-
-            if "\\n" in creds_dict["private_key"]:
-                creds_dict["private_key"] = creds_dict["private_key"].replace(
-                    "\\n", "\n"
-                )
-
-            cred = credentials.Certificate(creds_dict)
+            cred = get_firebase_credentials()
             app = firebase_admin.initialize_app(
                 cred,
-                {"storageBucket": f"{creds_dict['project_id']}.firebasestorage.app"},
+                {"storageBucket": f"{cred.project_id}.firebasestorage.app"},
             )
             logger.info("Firebase initialized successfully")
             return app
@@ -107,14 +143,91 @@ def init_firebase() -> bool:
         return False
 
 
+@st.cache_data(ttl=300, show_spinner=False)
+def _blob_exists_cached(blob_name: str) -> bool:
+    """Check a blob in the Storage bucket; failures raise and are not cached."""
+    return get_firebase_manager().bucket.blob(blob_name).exists()
+
+
+def blob_exists(blob_name: str) -> bool:
+    """Check whether a blob already exists in the Storage bucket."""
+    try:
+        return _blob_exists_cached(blob_name)
+    except Exception as e:
+        logger.warning(f"Blob existence check failed: {e}")
+        return False
+
+
+def _prepare_image_upload(
+    image_data: Union[bytes, BinaryIO], file_name: str, folder: str
+) -> Tuple[BinaryIO, int, str, str]:
+    """
+    Measure an image and name its blob by content hash.
+
+    Identical uploads share one object. Returns the rewound stream, its size,
+    its content type and the blob name.
+    """
+    # Stream from a file object; bytes are wrapped without copying
+    stream = BytesIO(image_data) if isinstance(image_data, bytes) else image_data
+    stream.seek(0, os.SEEK_END)
+    size = stream.tell()
+    stream.seek(0)
+    content_type = infer_image_mime(stream.read(12))
+
+    stream.seek(0)
+    content_key = hashlib.file_digest(
+        stream, lambda: hashlib.blake2b(digest_size=16)
+    ).hexdigest()
+    file_extension = file_name.split(".")[-1] if "." in file_name else "jpg"
+    stream.seek(0)
+    return stream, size, content_type, f"{folder}/{content_key}.{file_extension}"
+
+
+def _upload_blob(
+    bucket: gcs.Bucket,
+    stream: BinaryIO,
+    size: int,
+    content_type: str,
+    blob_name: str,
+    file_name: str,
+) -> str:
+    """Upload a prepared image stream; raises on failure and never calls st.*."""
+    # Create blob; large files upload resumably in chunks
+    blob = bucket.blob(
+        blob_name,
+        chunk_size=UPLOAD_CHUNK_SIZE if size > UPLOAD_CHUNK_SIZE else None,
+    )
+
+    # Set metadata for better caching
+    blob.metadata = {
+        "contentType": content_type,
+        "cacheControl": "public, max-age=31536000",  # 1 year cache
+        "originalName": file_name,
+    }
+
+    # Upload with the client library's exponential-backoff retry
+    blob.upload_from_file(
+        stream,
+        rewind=True,
+        size=size,
+        content_type=content_type,
+        retry=DEFAULT_RETRY,
+    )
+
+    # The bucket grants public read at bucket level, so no per-object ACL
+    logger.info(f"Image uploaded successfully: {blob_name}")
+    return blob.public_url
+
+
 def upload_image_to_storage(
-    image_bytes: bytes, file_name: str, folder: str = "products"
+    image_data: Union[bytes, BinaryIO], file_name: str, folder: str = "products"
 ) -> Optional[str]:
     """
     Upload image bytes to Firebase Storage with optimized settings.
 
     Args:
-        image_bytes: Raw image data
+        image_data: Raw image data, or a seekable binary file-like object
+            (uploaded without copying it into bytes)
         file_name: Original file name
         folder: Storage folder (default: "products")
 
@@ -122,41 +235,22 @@ def upload_image_to_storage(
         Public URL of uploaded image or None if failed
     """
     try:
-        manager = get_firebase_manager()
-        bucket = manager.bucket
-
-        # Generate unique filename
-        file_extension = file_name.split(".")[-1] if "." in file_name else "jpg"
-        unique_filename = f"{folder}/{uuid4().hex}_{datetime.now().strftime('%Y%m%d_%H%M%S')}.{file_extension}"
-
-        # Create blob
-        blob = bucket.blob(unique_filename)
+        bucket = get_firebase_manager().bucket
+        stream, size, content_type, blob_name = _prepare_image_upload(
+            image_data, file_name, folder
+        )
 
-        # Set metadata for better caching
-        blob.metadata = {
-            "contentType": f"image/{file_extension}",
-            "cacheControl": "public, max-age=31536000",  # 1 year cache
-            "originalName": file_name,
-        }
+        if blob_exists(blob_name):
+            logger.info(f"Image already stored, skipping upload: {blob_name}")
+            return bucket.blob(blob_name).public_url
 
-        # Upload with retry mechanism
-        max_retries = 3
-        for attempt in range(max_retries):
-            try:
-                blob.upload_from_string(
-                    image_bytes, content_type=f"image/{file_extension}"
-                )
-                break
-            except Exception as e:
-                if attempt == max_retries - 1:
-                    raise
-                logger.warning(f"Upload attempt {attempt + 1} failed: {e}")
-
-        # Make public
-        blob.make_public()
+        image_url = _upload_blob(
+            bucket, stream, size, content_type, blob_name, file_name
+        )
 
-        logger.info(f"Image uploaded successfully: {unique_filename}")
-        return blob.public_url
+        # Drop the cached "missing" answer for this blob
+        _blob_exists_cached.clear(blob_name)
+        return image_url
 
     except Exception as e:
         logger.error(f"Image upload failed: {e}")
@@ -164,6 +258,51 @@ def upload_image_to_storage(
         return None
 
 
+def _prepare_artisan_record(artisan_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Add write metadata to an artisan record."""
+    return {
+        **artisan_data,
+        "timestamp": firestore.SERVER_TIMESTAMP,
+        "created_at": datetime.utcnow().isoformat(),
+        "version": "1.0",
+        "status": "active",
+    }
+
+
+def _missing_artisan_fields(record: Dict[str, Any]) -> List[str]:
+    """List required artisan fields that are missing or empty."""
+    return [field for field in ARTISAN_REQUIRED_FIELDS if not record.get(field)]
+
+
+def _add_artisan_record(
+    db: firestore.Client, artisan_data: Dict[str, Any]
+) -> Tuple[str, str]:
+    """Write one artisan record; raises on failure and never calls st.*."""
+    # Prepare data with metadata
+    enhanced_data = _prepare_artisan_record(artisan_data)
+
+    # Add data validation
+    missing_fields = _missing_artisan_fields(enhanced_data)
+    if missing_fields:
+        raise ValueError(f"Missing required data: {', '.join(missing_fields)}")
+
+    # Save to Firestore
+    doc_ref = db.collection("artisans").add(enhanced_data)
+    document_id = doc_ref[1].id
+
+    logger.info(f"Artisan data saved successfully: {document_id}")
+    return ("artisans", document_id)
+
+
+def _report_save_error(error: Exception) -> None:
+    """Log and show a failed artisan save."""
+    logger.error(f"Failed to save artisan data: {error}")
+    if isinstance(error, ValueError):
+        st.error(str(error))
+    else:
+        st.error(f"Failed to save data: {error}")
+
+
 def save_artisan_data(artisan_data: Dict[str, Any]) -> Optional[Tuple[str, str]]:
     """
     Save artisan and product data to Firestore with enhanced structure.
@@ -174,39 +313,53 @@ def save_artisan_data(artisan_data: Dict[str, Any]) -> Optional[Tuple[str, str]]
     Returns:
         Tuple of (collection_id, document_id) or None if failed
     """
+    try:
+        return _add_artisan_record(get_firebase_manager().db, artisan_data)
+    except Exception as e:
+        _report_save_error(e)
+        return None
+
+
+def save_artisan_data_bulk(records: List[Dict[str, Any]]) -> Optional[List[str]]:
+    """
+    Save many artisan records with batched Firestore writes.
+
+    Args:
+        records: List of artisan data dictionaries
+
+    Returns:
+        Document IDs in the same order as records, or None if failed
+    """
+    prepared = [_prepare_artisan_record(record) for record in records]
+    invalid = [
+        index
+        for index, record in enumerate(prepared)
+        if _missing_artisan_fields(record)
+    ]
+    if invalid:
+        logger.error(f"Records missing required fields: {invalid}")
+        st.error(f"{len(invalid)} record(s) are missing required data")
+        return None
+
     try:
         manager = get_firebase_manager()
         db = manager.db
+        collection = db.collection("artisans")
 
-        # Prepare data with metadata
-        enhanced_data = {
-            **artisan_data,
-            "timestamp": firestore.SERVER_TIMESTAMP,
-            "created_at": datetime.utcnow().isoformat(),
-            "version": "1.0",
-            "status": "active",
-        }
-
-        # Add data validation
-        required_fields = ["name", "craft_type", "description"]
-        missing_fields = [
-            field for field in required_fields if not enhanced_data.get(field)
-        ]
-
-        if missing_fields:
-            logger.error(f"Missing required fields: {missing_fields}")
-            st.error(f"Missing required data: {', '.join(missing_fields)}")
-            return None
-
-        # Save to Firestore
-        doc_ref = db.collection("artisans").add(enhanced_data)
-        document_id = doc_ref[1].id
+        document_ids = []
+        for start in range(0, len(prepared), FIRESTORE_BATCH_LIMIT):
+            batch = db.batch()
+            for record in prepared[start : start + FIRESTORE_BATCH_LIMIT]:
+                doc_ref = collection.document()
+                batch.set(doc_ref, record)
+                document_ids.append(doc_ref.id)
+            batch.commit()
 
-        logger.info(f"Artisan data saved successfully: {document_id}")
-        return ("artisans", document_id)
+        logger.info(f"Artisan data saved in bulk: {len(document_ids)} documents")
+        return document_ids
 
     except Exception as e:
-        logger.error(f"Failed to save artisan data: {e}")
+        logger.error(f"Failed to save artisan data in bulk: {e}")
         st.error(f"Failed to save data: {e}")
         return None
 
@@ -271,6 +424,100 @@ def update_artisan_data(document_id: str, updates: Dict[str, Any]) -> bool:
         return False
 
 
+def save_artisan_with_image(
+    image_data: Union[bytes, BinaryIO], file_name: str, artisan_data: Dict[str, Any]
+) -> Optional[Tuple[str, str]]:
+    """
+    Upload the product image and save artisan data concurrently.
+
+    The Firestore document is written with a placeholder image URL while the
+    upload runs, then patched with the real URL (or marked as failed). The
+    workers only do network I/O; errors are reported from the calling thread.
+
+    Args:
+        image_data: Raw image data or a seekable binary file-like object
+        file_name: Original file name
+        artisan_data: Dictionary containing artisan information
+
+    Returns:
+        Tuple of (collection_id, document_id), or None if the save or the
+        image upload failed
+    """
+    try:
+        manager = get_firebase_manager()
+        bucket, db = manager.bucket, manager.db
+        stream, size, content_type, blob_name = _prepare_image_upload(
+            image_data, file_name, "products"
+        )
+        image_url = (
+            bucket.blob(blob_name).public_url if blob_exists(blob_name) else None
+        )
+    except Exception as e:
+        logger.error(f"Image upload failed: {e}")
+        st.error(f"Failed to upload image: {e}")
+        return None
+
+    upload_error = None
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        url_future = (
+            executor.submit(
+                _upload_blob, bucket, stream, size, content_type, blob_name, file_name
+            )
+            if image_url is None
+            else None
+        )
+        doc_future = executor.submit(
+            _add_artisan_record, db, {**artisan_data, "product_image_url": "pending"}
+        )
+
+        if url_future is not None:
+            try:
+                image_url = url_future.result()
+                _blob_exists_cached.clear(blob_name)
+            except Exception as e:
+                upload_error = e
+
+        try:
+            saved = doc_future.result()
+        except Exception as e:
+            _report_save_error(e)
+            return None
+
+    _, document_id = saved
+    if upload_error is not None:
+        logger.error(
+            f"Image upload failed for artisan document {document_id}: {upload_error}"
+        )
+        st.error(f"Failed to upload image: {upload_error}")
+        update_artisan_data(
+            document_id, {"product_image_url": None, "status": "upload_failed"}
+        )
+        return None
+
+    update_artisan_data(document_id, {"product_image_url": image_url})
+    return saved
+
+
+def blob_name_from_url(image_url: str, bucket_name: str) -> str:
+    """
+    Extract the blob name from a Storage public or Firebase download URL.
+
+    Args:
+        image_url: URL of the form ``https://storage.googleapis.com/<bucket>/<name>``
+            or ``https://firebasestorage.googleapis.com/v0/b/<bucket>/o/<name>``
+        bucket_name: Name of the bucket holding the blob
+
+    Returns:
+        Blob name, URL-decoded
+    """
+    path = unquote(urlparse(image_url).path)
+    for prefix in (f"/b/{bucket_name}/o/", f"/{bucket_name}/"):
+        _, sep, blob_name = path.partition(prefix)
+        if sep:
+            return blob_name
+    raise ValueError(f"URL does not point into bucket {bucket_name}: {image_url}")
+
+
 def delete_image_from_storage(image_url: str) -> bool:
     """
     Delete image from Firebase Storage.
@@ -286,11 +533,11 @@ def delete_image_from_storage(image_url: str) -> bool:
         bucket = manager.bucket
 
         # Extract blob name from URL
-        blob_name = image_url.split("/")[-1].split("?")[0]
-        blob_name = blob_name.replace("%2F", "/")  # Decode URL encoding
+        blob_name = blob_name_from_url(image_url, bucket.name)
 
         blob = bucket.blob(blob_name)
         blob.delete()
+        _blob_exists_cached.clear(blob_name)
 
         logger.info(f"Image deleted successfully: {blob_name}")
         return True
@@ -300,7 +547,7 @@ def delete_image_from_storage(image_url: str) -> bool:
         return False
 
 
-@st.cache_data(ttl=300)  # Cache for 5 minutes
+@st.cache_data(ttl=1800)  # Cache for 30 minutes
 def check_firebase_health() -> Dict[str, bool]:
     """
     Check Firebase services health status.
@@ -313,24 +560,17 @@ def check_firebase_health() -> Dict[str, bool]:
     try:
         manager = get_firebase_manager()
 
-        # Test Firestore
+        # Test Firestore (client-side readiness, no billed read)
         try:
-            db = manager.db
-            # Try a simple read operation
-            db.collection("_health_check").limit(1).get()
-            health_status["firestore"] = True
+            health_status["firestore"] = bool(manager.db.project)
         except Exception as e:
             logger.warning(f"Firestore health check failed: {e}")
 
-        # Test Storage
+        # Test Storage with a single bucket metadata request
         try:
-            bucket = manager.bucket
-            # Try to get bucket metadata
-            bucket.get_blob("non-existent-file")  # This will fail gracefully
-            health_status["storage"] = True
-        except Exception:
-            # Expected to fail for non-existent file, but bucket is accessible
-            health_status["storage"] = True
+            health_status["storage"] = manager.bucket.exists()
+        except Exception as e:
+            logger.warning(f"Storage health check failed: {e}")
 
         health_status["overall"] = all(
             [health_status["firestore"], health_status["storage"]]
@@ -4,14 +4,19 @@ import json
 import streamlit as st
 from google.cloud import speech, translate_v2 as translate, vision
 from google.oauth2 import service_account
-from pydub import AudioSegment
+import hashlib
 import io
 import logging
-from typing import Optional, List, Union
+from typing import Any, BinaryIO, Callable, Dict, Iterable, Optional, List, Tuple, Union
 from io import BytesIO
 from PIL import Image
-from contextlib import contextmanager
-import tempfile
+import subprocess
+import wave
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from utils.image_utils import ImageProcessor, shrink_for_api
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -21,7 +26,21 @@ logger = logging.getLogger(__name__)
 SUPPORTED_AUDIO_FORMATS = ["wav", "mp3", "flac", "ogg"]
 MAX_AUDIO_SIZE_MB = 10
 DEFAULT_SAMPLE_RATE = 16000
+FFMPEG_TIMEOUT = 30  # seconds
+AUDIO_READ_CHUNK_SIZE = 1024 * 1024  # Bytes per read when sizing uploads
+SYNC_RECOGNIZE_MAX_SECONDS = 55  # Speech API sync limit is 60 s
+LONG_RUNNING_TIMEOUT = 300  # seconds
+FLAC_MIN_BYTES = 512 * 1024  # ~16 s of 16 kHz mono PCM
+
+# Cache media arguments by a fast content digest instead of Streamlit's hasher
+BYTES_HASH_FUNCS = {bytes: lambda data: hashlib.blake2b(data, digest_size=16).digest()}
 MAX_VISION_LABELS = 20
+VISION_BATCH_SIZE = 16  # Images per batch_annotate_images call
+TRANSLATE_BATCH_SIZE = 128  # Strings per Translation API request
+# Translation and label results are persisted to disk so they survive
+# restarts. Streamlit ignores TTLs on persisted caches, so they are bounded by
+# entry count, and only successful results are cached.
+PERSISTED_CACHE_ENTRIES = 10000
 
 
 class GCPCredentialsManager:
@@ -72,18 +91,24 @@ def get_credentials_manager() -> GCPCredentialsManager:
     return _creds_manager
 
 
-@contextmanager
-def temp_audio_file(audio_data: bytes, format_type: str = "wav"):
-    """Create temporary audio file for processing."""
-    temp_file = None
-    try:
-        temp_file = tempfile.NamedTemporaryFile(delete=False, suffix=f".{format_type}")
-        temp_file.write(audio_data)
-        temp_file.close()
-        yield temp_file.name
-    finally:
-        if temp_file and os.path.exists(temp_file.name):
-            os.unlink(temp_file.name)
+@st.cache_resource(show_spinner=False)
+def get_speech_client() -> speech.SpeechClient:
+    """Get the Speech-to-Text client shared across sessions."""
+    return speech.SpeechClient(credentials=get_credentials_manager().credentials)
+
+
+@st.cache_resource(show_spinner=False)
+def get_translate_client() -> translate.Client:
+    """Get the Translation client shared across sessions."""
+    return translate.Client(credentials=get_credentials_manager().credentials)
+
+
+@st.cache_resource(show_spinner=False)
+def get_vision_client() -> vision.ImageAnnotatorClient:
+    """Get the Vision client shared across sessions."""
+    return vision.ImageAnnotatorClient(
+        credentials=get_credentials_manager().credentials
+    )
 
 
 class AudioProcessor:
@@ -95,6 +120,25 @@ class AudioProcessor:
         size_mb = len(audio_bytes) / (1024 * 1024)
         return size_mb <= MAX_AUDIO_SIZE_MB
 
+    @staticmethod
+    def validate_audio_stream(audio_file: BinaryIO) -> Tuple[bool, bytes]:
+        """
+        Read an audio file object, stopping as soon as it exceeds the size limit.
+
+        Args:
+            audio_file: Binary file-like object (e.g. a Streamlit UploadedFile)
+
+        Returns:
+            Tuple of (within limit, audio bytes or b"" if too large)
+        """
+        max_bytes = MAX_AUDIO_SIZE_MB * 1024 * 1024
+        buffer = bytearray()
+        while chunk := audio_file.read(AUDIO_READ_CHUNK_SIZE):
+            buffer += chunk
+            if len(buffer) > max_bytes:
+                return False, b""
+        return True, bytes(buffer)
+
     @staticmethod
     def convert_to_mono(
         audio_bytes: bytes, target_sample_rate: int = DEFAULT_SAMPLE_RATE
@@ -110,17 +154,42 @@ class AudioProcessor:
             Processed audio bytes
         """
         try:
-            # Load audio with pydub
-            audio = AudioSegment.from_file(io.BytesIO(audio_bytes))
-
-            # Convert to mono and set sample rate
-            audio = audio.set_channels(1).set_frame_rate(target_sample_rate)
-
-            # Export to bytes
-            buffer = io.BytesIO()
-            audio.export(buffer, format="wav")
+            # Fast path: recorder output is PCM WAV, handled in-process
+            processed_audio = AudioProcessor._convert_wav_to_mono(
+                audio_bytes, target_sample_rate
+            )
+            if processed_audio is not None:
+                logger.info(
+                    f"Audio converted: {len(audio_bytes)} -> {len(processed_audio)} bytes"
+                )
+                return processed_audio
+
+            # Other formats are piped through ffmpeg without temp files
+            result = subprocess.run(
+                [
+                    "ffmpeg",
+                    "-hide_banner",
+                    "-loglevel",
+                    "error",
+                    "-i",
+                    "pipe:0",
+                    "-ac",
+                    "1",
+                    "-ar",
+                    str(target_sample_rate),
+                    "-acodec",
+                    "pcm_s16le",
+                    "-f",
+                    "wav",
+                    "pipe:1",
+                ],
+                input=audio_bytes,
+                capture_output=True,
+                timeout=FFMPEG_TIMEOUT,
+                check=True,
+            )
 
-            processed_audio = buffer.getvalue()
+            processed_audio = result.stdout
             logger.info(
                 f"Audio converted: {len(audio_bytes)} -> {len(processed_audio)} bytes"
             )
@@ -130,16 +199,152 @@ class AudioProcessor:
             logger.error(f"Audio conversion error: {e}")
             return audio_bytes  # Return original on failure
 
+    @staticmethod
+    def encode_flac(wav_bytes: bytes) -> Optional[bytes]:
+        """Losslessly re-encode WAV audio as FLAC through ffmpeg; None on failure."""
+        try:
+            result = subprocess.run(
+                [
+                    "ffmpeg",
+                    "-hide_banner",
+                    "-loglevel",
+                    "error",
+                    "-i",
+                    "pipe:0",
+                    "-compression_level",
+                    "5",
+                    "-f",
+                    "flac",
+                    "pipe:1",
+                ],
+                input=wav_bytes,
+                capture_output=True,
+                timeout=FFMPEG_TIMEOUT,
+                check=True,
+            )
+            return result.stdout
+        except Exception as e:
+            logger.warning(f"FLAC encoding failed, sending LINEAR16: {e}")
+            return None
+
+    @staticmethod
+    def convert_and_describe(
+        audio_bytes: bytes, target_sample_rate: int = DEFAULT_SAMPLE_RATE
+    ) -> Tuple[bytes, dict]:
+        """
+        Convert audio to mono and describe the result without decoding it again.
+
+        Args:
+            audio_bytes: Raw audio data
+            target_sample_rate: Target sample rate (default: 16000)
+
+        Returns:
+            Tuple of (processed audio bytes, audio properties)
+        """
+        processed_audio = AudioProcessor.convert_to_mono(
+            audio_bytes, target_sample_rate
+        )
+        if processed_audio is audio_bytes:
+            # Input was already mono at the target rate, or conversion failed
+            # and returned the original; inspect it instead
+            return audio_bytes, AudioProcessor.detect_audio_properties(audio_bytes)
+
+        # Converted output is always mono 16-bit PCM WAV at the target rate;
+        # only the header is parsed, to find where the samples start
+        buffer = io.BytesIO(processed_audio)
+        with wave.open(buffer, "rb") as reader:
+            # Piped ffmpeg output has no final data size, so also bound the
+            # frame count by the bytes actually present after the header
+            frames = min(
+                reader.getnframes(), (len(processed_audio) - buffer.tell()) // 2
+            )
+        return processed_audio, {
+            "channels": 1,
+            "frame_rate": target_sample_rate,
+            "sample_width": 2,
+            "duration_seconds": frames / target_sample_rate,
+            "format": "wav",
+        }
+
+    @staticmethod
+    def _convert_wav_to_mono(
+        audio_bytes: bytes, target_sample_rate: int
+    ) -> Optional[bytes]:
+        """Downmix and resample 16-bit PCM WAV with NumPy; None for other input."""
+        if audio_bytes[:4] != b"RIFF" or audio_bytes[8:12] != b"WAVE":
+            return None
+
+        try:
+            with wave.open(io.BytesIO(audio_bytes), "rb") as reader:
+                if reader.getsampwidth() != 2:
+                    return None
+                channels = reader.getnchannels()
+                sample_rate = reader.getframerate()
+                if channels == 1 and sample_rate == target_sample_rate:
+                    # Already in the target format; nothing to decode
+                    return audio_bytes
+                frames = reader.readframes(reader.getnframes())
+        except (wave.Error, EOFError):
+            return None
+
+        samples = np.frombuffer(frames, dtype="<i2").reshape(-1, channels)
+        mono = samples.mean(axis=1, dtype=np.float32)
+
+        # Linear resampling, as pydub's set_frame_rate used to do
+        if sample_rate != target_sample_rate and len(mono):
+            target_length = int(len(mono) * target_sample_rate / sample_rate)
+            positions = np.arange(target_length) * (sample_rate / target_sample_rate)
+            mono = np.interp(positions, np.arange(len(mono)), mono)
+
+        with io.BytesIO() as buffer:
+            with wave.open(buffer, "wb") as writer:
+                writer.setnchannels(1)
+                writer.setsampwidth(2)
+                writer.setframerate(target_sample_rate)
+                writer.writeframes(np.round(mono).astype("<i2").tobytes())
+            return buffer.getvalue()
+
     @staticmethod
     def detect_audio_properties(audio_bytes: bytes) -> dict:
         """Detect audio properties for optimization."""
         try:
-            audio = AudioSegment.from_file(io.BytesIO(audio_bytes))
+            with wave.open(io.BytesIO(audio_bytes), "rb") as reader:
+                return {
+                    "channels": reader.getnchannels(),
+                    "frame_rate": reader.getframerate(),
+                    "sample_width": reader.getsampwidth(),
+                    "duration_seconds": reader.getnframes() / reader.getframerate(),
+                    "format": "wav",
+                }
+        except (wave.Error, EOFError):
+            pass
+
+        # Other formats: read the container header with ffprobe, no decode
+        try:
+            result = subprocess.run(
+                [
+                    "ffprobe",
+                    "-v",
+                    "quiet",
+                    "-print_format",
+                    "json",
+                    "-show_streams",
+                    "-show_format",
+                    "-i",
+                    "pipe:0",
+                ],
+                input=audio_bytes,
+                capture_output=True,
+                timeout=FFMPEG_TIMEOUT,
+                check=True,
+            )
+            probe = json.loads(result.stdout)
+            stream = next(s for s in probe["streams"] if s.get("codec_type") == "audio")
             return {
-                "channels": audio.channels,
-                "frame_rate": audio.frame_rate,
-                "sample_width": audio.sample_width,
-                "duration_seconds": len(audio) / 1000.0,
+                "channels": int(stream["channels"]),
+                "frame_rate": int(stream["sample_rate"]),
+                "sample_width": int(stream.get("bits_per_sample") or 16) // 8,
+                "duration_seconds": float(probe["format"].get("duration", 0)),
                 "format": "wav",  # Default after conversion
             }
         except Exception as e:
@@ -147,9 +352,8 @@ class AudioProcessor:
             return {"channels": 1, "frame_rate": DEFAULT_SAMPLE_RATE, "format": "wav"}
 
 
-@st.cache_data(ttl=300, show_spinner=False)
 def transcribe_audio(
-    audio_bytes: bytes,
+    audio: Union[bytes, BinaryIO],
     language_code: str = "en-US",
     enable_automatic_punctuation: bool = True,
 ) -> Optional[str]:
@@ -157,13 +361,28 @@ def transcribe_audio(
     Transcribe audio using Google Cloud Speech-to-Text with optimizations.
 
     Args:
-        audio_bytes: Raw audio data
+        audio: Raw audio data, or a binary file-like object; oversized files
+            are rejected without being read in full
         language_code: Language code (e.g., 'en-US', 'hi-IN')
         enable_automatic_punctuation: Enable automatic punctuation
 
     Returns:
         Transcribed text or None if failed
     """
+    if not isinstance(audio, bytes):
+        within_limit, audio = AudioProcessor.validate_audio_stream(audio)
+        if not within_limit:
+            st.error(f"Audio file too large. Maximum size: {MAX_AUDIO_SIZE_MB}MB")
+            return None
+
+    return _transcribe_audio_bytes(audio, language_code, enable_automatic_punctuation)
+
+
+@st.cache_data(ttl=300, show_spinner=False, hash_funcs=BYTES_HASH_FUNCS)
+def _transcribe_audio_bytes(
+    audio_bytes: bytes, language_code: str, enable_automatic_punctuation: bool
+) -> Optional[str]:
+    """Transcribe in-memory audio; cached by content digest."""
     creds_manager = get_credentials_manager()
     if not creds_manager.is_available():
         st.error("GCP credentials not available for speech recognition.")
@@ -175,17 +394,26 @@ def transcribe_audio(
         return None
 
     try:
-        # Initialize client
-        client = speech.SpeechClient(credentials=creds_manager.credentials)
+        # Shared client (channels are reused across calls)
+        client = get_speech_client()
 
         # Process audio
-        processor = AudioProcessor()
-        processed_audio = processor.convert_to_mono(audio_bytes)
-        audio_properties = processor.detect_audio_properties(processed_audio)
+        processed_audio, audio_properties = AudioProcessor.convert_and_describe(
+            audio_bytes
+        )
+
+        # Longer clips go over the wire as FLAC, which is lossless and roughly
+        # half the size; short ones are not worth an ffmpeg spawn
+        encoding = speech.RecognitionConfig.AudioEncoding.LINEAR16
+        if len(processed_audio) > FLAC_MIN_BYTES:
+            flac_audio = AudioProcessor.encode_flac(processed_audio)
+            if flac_audio:
+                processed_audio = flac_audio
+                encoding = speech.RecognitionConfig.AudioEncoding.FLAC
 
         # Prepare recognition config
         config = speech.RecognitionConfig(
-            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            encoding=encoding,
             language_code=language_code,
             sample_rate_hertz=audio_properties["frame_rate"],
             enable_automatic_punctuation=enable_automatic_punctuation,
@@ -196,13 +424,20 @@ def transcribe_audio(
 
         audio = speech.RecognitionAudio(content=processed_audio)
 
-        # Perform transcription
+        # Perform transcription; synchronous recognize rejects audio over a
+        # minute, so longer clips use a long-running operation
         with st.spinner("Transcribing audio..."):
-            response = client.recognize(config=config, audio=audio)
+            if audio_properties.get("duration_seconds", 0) > SYNC_RECOGNIZE_MAX_SECONDS:
+                operation = client.long_running_recognize(config=config, audio=audio)
+                response = operation.result(timeout=LONG_RUNNING_TIMEOUT)
+            else:
+                response = client.recognize(config=config, audio=audio)
 
         if response.results:
-            transcript = response.results[0].alternatives[0].transcript
-            confidence = response.results[0].alternatives[0].confidence
+            # Long clips come back as consecutive segments
+            alternatives = [result.alternatives[0] for result in response.results]
+            transcript = " ".join(alt.transcript.strip() for alt in alternatives)
+            confidence = min(alt.confidence for alt in alternatives)
 
             logger.info(f"Transcription successful (confidence: {confidence:.2f})")
 
@@ -222,7 +457,77 @@ def transcribe_audio(
         return None
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
+def transcribe_audio_streaming(
+    audio_chunks: Iterable[bytes],
+    language_code: str = "en-US",
+    sample_rate: int = DEFAULT_SAMPLE_RATE,
+    on_interim: Optional[Callable[[str], None]] = None,
+) -> Optional[str]:
+    """
+    Transcribe audio while it is still arriving, using streaming recognition.
+
+    Chunks are sent as they are produced, so recognition overlaps the upload.
+    A live source can be bridged in with ``iter(audio_queue.get, None)``.
+
+    Args:
+        audio_chunks: Iterable of raw LINEAR16 mono PCM chunks (no WAV header)
+        language_code: Language code (e.g., 'en-US', 'hi-IN')
+        sample_rate: Sample rate of the PCM chunks
+        on_interim: Optional callback receiving interim transcripts
+
+    Returns:
+        Transcribed text or None if failed
+    """
+    creds_manager = get_credentials_manager()
+    if not creds_manager.is_available():
+        st.error("GCP credentials not available for speech recognition.")
+        return None
+
+    try:
+        client = get_speech_client()
+
+        config = speech.RecognitionConfig(
+            encoding=speech.RecognitionConfig.AudioEncoding.LINEAR16,
+            language_code=language_code,
+            sample_rate_hertz=sample_rate,
+            enable_automatic_punctuation=True,
+            audio_channel_count=1,
+        )
+        streaming_config = speech.StreamingRecognitionConfig(
+            config=config, interim_results=on_interim is not None
+        )
+        requests = (
+            speech.StreamingRecognizeRequest(audio_content=chunk)
+            for chunk in audio_chunks
+            if chunk
+        )
+
+        transcripts = []
+        for response in client.streaming_recognize(
+            config=streaming_config, requests=requests
+        ):
+            for result in response.results:
+                if not result.alternatives:
+                    continue
+                text = result.alternatives[0].transcript.strip()
+                if result.is_final:
+                    transcripts.append(text)
+                elif on_interim is not None:
+                    on_interim(text)
+
+        if not transcripts:
+            logger.warning("No streaming transcription results returned")
+            return None
+
+        logger.info(f"Streaming transcription successful: {len(transcripts)} segments")
+        return " ".join(transcripts)
+
+    except Exception as e:
+        logger.error(f"Streaming Speech-to-Text Error: {e}")
+        st.error(f"Transcription failed: {str(e)}")
+        return None
+
+
 def translate_text(
     text: str, target_language: str = "en", source_language: Optional[str] = None
 ) -> Optional[str]:
@@ -247,14 +552,9 @@ def translate_text(
         return None
 
     try:
-        # Initialize client
-        translate_client = translate.Client(credentials=creds_manager.credentials)
-
         # Perform translation
         with st.spinner("Translating text..."):
-            result = translate_client.translate(
-                text, target_language=target_language, source_language=source_language
-            )
+            result = _translate_cached((text,), target_language, source_language)[0]
 
         translated_text = result["translatedText"]
         detected_language = result.get("detectedSourceLanguage")
@@ -273,6 +573,77 @@ def translate_text(
         return None
 
 
+def _translate_batch(
+    texts: List[str], target_language: str, source_language: Optional[str]
+) -> List[dict]:
+    """Translate texts with one request per TRANSLATE_BATCH_SIZE strings."""
+    # Shared client (connections are reused across calls)
+    translate_client = get_translate_client()
+
+    results = []
+    for offset in range(0, len(texts), TRANSLATE_BATCH_SIZE):
+        results.extend(
+            translate_client.translate(
+                texts[offset : offset + TRANSLATE_BATCH_SIZE],
+                target_language=target_language,
+                source_language=source_language,
+            )
+        )
+    return results
+
+
+@st.cache_data(show_spinner=False, persist="disk", max_entries=PERSISTED_CACHE_ENTRIES)
+def _translate_cached(
+    texts: Tuple[str, ...], target_language: str, source_language: Optional[str]
+) -> List[dict]:
+    """Translate texts, persisting results; failures raise and are not cached."""
+    return _translate_batch(list(texts), target_language, source_language)
+
+
+def translate_texts(
+    texts: List[str], target_language: str = "en", source_language: Optional[str] = None
+) -> List[Optional[str]]:
+    """
+    Translate several texts with batched Cloud Translation requests.
+
+    Args:
+        texts: Texts to translate
+        target_language: Target language code
+        source_language: Source language code (auto-detect if None)
+
+    Returns:
+        Translated texts in input order; None for empty inputs or on failure
+    """
+    translations: List[Optional[str]] = [None] * len(texts)
+    indices = [index for index, text in enumerate(texts) if text and text.strip()]
+    if not indices:
+        return translations
+
+    creds_manager = get_credentials_manager()
+    if not creds_manager.is_available():
+        st.error("GCP credentials not available for translation.")
+        return translations
+
+    try:
+        with st.spinner("Translating text..."):
+            results = _translate_cached(
+                tuple(texts[index] for index in indices),
+                target_language,
+                source_language,
+            )
+
+        for index, result in zip(indices, results):
+            translations[index] = result["translatedText"]
+
+        logger.info(f"Batch translation successful: {len(indices)} texts")
+        return translations
+
+    except Exception as e:
+        logger.error(f"Translation Error: {e}")
+        st.error(f"Translation failed: {str(e)}")
+        return translations
+
+
 class VisionAnalyzer:
     """Optimized image analysis using Google Cloud Vision."""
 
@@ -285,9 +656,7 @@ class VisionAnalyzer:
         if self._client is None:
             creds_manager = get_credentials_manager()
             if creds_manager.is_available():
-                self._client = vision.ImageAnnotatorClient(
-                    credentials=creds_manager.credentials
-                )
+                self._client = get_vision_client()
         return self._client
 
     def _prepare_image(self, image: Image.Image) -> bytes:
@@ -298,14 +667,187 @@ class VisionAnalyzer:
             image = image.copy()
             image.thumbnail(max_size, Image.Resampling.LANCZOS)
 
-        # Convert to bytes
-        buffer = BytesIO()
-        format_type = "JPEG" if image.mode == "RGB" else "PNG"
-        image.save(buffer, format=format_type, quality=85, optimize=True)
-        return buffer.getvalue()
+        # Convert to bytes, with transparency composited onto white the same
+        # way shrink_for_api prepares encoded uploads
+        image = ImageProcessor.flatten_to_rgb(image)
+        with BytesIO() as buffer:
+            image.save(buffer, format="JPEG", quality=85, optimize=True)
+            return buffer.getvalue()
+
+    def _prepare_image_bytes(self, image_bytes: bytes) -> bytes:
+        """Prepare encoded image bytes for Vision API, decoding only if too large."""
+        return shrink_for_api(image_bytes)
+
+    def annotate_batch(
+        self,
+        images_bytes: List[bytes],
+        feature_types: Iterable[str],
+        max_results: int = MAX_VISION_LABELS,
+    ) -> List[vision.AnnotateImageResponse]:
+        """Run Vision features on images, up to VISION_BATCH_SIZE per RPC."""
+        features = [
+            vision.Feature(type_=vision.Feature.Type[name], max_results=max_results)
+            for name in feature_types
+        ]
+        # Send uploads as-is; only oversized images are downscaled
+        requests = [
+            vision.AnnotateImageRequest(
+                image=vision.Image(content=self._prepare_image_bytes(data)),
+                features=features,
+            )
+            for data in images_bytes
+        ]
+
+        responses = []
+        for offset in range(0, len(requests), VISION_BATCH_SIZE):
+            batch = self.client.batch_annotate_images(
+                requests=requests[offset : offset + VISION_BATCH_SIZE]
+            )
+            responses.extend(batch.responses)
+        return responses
+
+
+def _labels_from_response(
+    response: vision.AnnotateImageResponse, max_results: int, min_score: float
+) -> List[str]:
+    """Extract labels above min_score from one annotation response, best first."""
+    if response.error.message:
+        raise Exception(f"Vision API error: {response.error.message}")
+
+    # Filter, then sort the survivors by relevance (score)
+    labels = sorted(
+        (label for label in response.label_annotations if label.score >= min_score),
+        key=lambda x: x.score,
+        reverse=True,
+    )
+    return [label.description for label in labels[:max_results]]
+
+
+def _annotate_images_batch(
+    images_bytes: List[bytes],
+    features: Iterable[str],
+    max_results: int,
+    parse: Callable[[vision.AnnotateImageResponse], Any],
+    default: Callable[[], Any],
+) -> List[Any]:
+    """
+    Run Vision features over several images and parse each response.
+
+    Images whose response fails to parse, or all images if the batch cannot
+    run, get ``default()`` so results always line up with images_bytes.
+    """
+    results = [default() for _ in images_bytes]
+    if not images_bytes:
+        return results
+
+    creds_manager = get_credentials_manager()
+    if not creds_manager.is_available():
+        st.error("GCP credentials not available for Vision AI.")
+        return results
+
+    try:
+        analyzer = VisionAnalyzer()
+        if not analyzer.client:
+            logger.error("Failed to initialize Vision API client")
+            return results
+
+        # Perform detection in batched calls
+        with st.spinner("Analyzing images..."):
+            responses = analyzer.annotate_batch(images_bytes, features, max_results)
+
+        for index, response in enumerate(responses):
+            try:
+                results[index] = parse(response)
+            except Exception as e:
+                logger.error(f"Cloud Vision AI Error (image {index}): {e}")
+
+        logger.info(f"Vision analysis successful: {len(images_bytes)} images")
+        return results
+
+    except Exception as e:
+        logger.error(f"Cloud Vision AI Error: {e}")
+        st.error(f"Image analysis failed: {str(e)}")
+        return results
+
+
+def get_image_labels_batch(
+    images_bytes: List[bytes],
+    max_results: int = MAX_VISION_LABELS,
+    min_score: float = 0.5,
+) -> List[List[str]]:
+    """
+    Analyze several images with Cloud Vision using batched label detection.
+
+    Args:
+        images_bytes: Encoded product images
+        max_results: Maximum number of labels to return per image
+        min_score: Minimum confidence score for labels
+
+    Returns:
+        List of label lists, in the same order as images_bytes
+    """
+    return _annotate_images_batch(
+        images_bytes,
+        ["LABEL_DETECTION"],
+        max_results,
+        lambda response: _labels_from_response(response, max_results, min_score),
+        list,
+    )
+
+
+def analyze_images_batch(
+    images_bytes: List[bytes],
+    features: Iterable[str] = ("LABEL_DETECTION", "TEXT_DETECTION"),
+    max_results: int = MAX_VISION_LABELS,
+    min_score: float = 0.5,
+) -> List[Dict[str, Any]]:
+    """
+    Run several Vision features over several images in batched calls.
+
+    Args:
+        images_bytes: Encoded images
+        features: Vision feature type names (e.g. "LABEL_DETECTION")
+        max_results: Maximum number of labels to return per image
+        min_score: Minimum confidence score for labels
+
+    Returns:
+        One dict per image with "labels" (list) and "text" (str or None)
+    """
+
+    def parse(response: vision.AnnotateImageResponse) -> Dict[str, Any]:
+        text = response.text_annotations
+        return {
+            "labels": _labels_from_response(response, max_results, min_score),
+            "text": text[0].description if text else None,
+        }
+
+    return _annotate_images_batch(
+        images_bytes,
+        features,
+        max_results,
+        parse,
+        lambda: {"labels": [], "text": None},
+    )
+
+
+@st.cache_data(
+    show_spinner=False,
+    persist="disk",
+    max_entries=PERSISTED_CACHE_ENTRIES,
+    hash_funcs=BYTES_HASH_FUNCS,
+)
+def _label_image_cached(
+    image_bytes: bytes, max_results: int, min_score: float
+) -> List[str]:
+    """Label one image, persisting results; failures raise and are not cached."""
+    analyzer = VisionAnalyzer()
+    if not analyzer.client:
+        raise RuntimeError("Failed to initialize Vision API client")
+
+    response = analyzer.annotate_batch([image_bytes], ["LABEL_DETECTION"], max_results)
+    return _labels_from_response(response[0], max_results, min_score)
 
 
-@st.cache_data(ttl=3600, show_spinner=False)
 def get_image_labels(
     image_bytes: bytes, max_results: int = MAX_VISION_LABELS, min_score: float = 0.5
 ) -> List[str]:
@@ -313,7 +855,7 @@ def get_image_labels(
     Analyze image using Google Cloud Vision AI with optimization.
 
     Args:
-        image: PIL Image object
+        image_bytes: Encoded product image
         max_results: Maximum number of labels to return
         min_score: Minimum confidence score for labels
 
@@ -326,47 +868,11 @@ def get_image_labels(
         return []
 
     try:
-        # ✅ Convert bytes back to a PIL Image for processing
-        image = Image.open(BytesIO(image_bytes))
-
-        analyzer = VisionAnalyzer()
-        client = analyzer.client
-
-        if not client:
-            logger.error("Failed to initialize Vision API client")
-            return []
-
-        # Prepare image (the rest of the function uses the restored 'image' object)
-        prepared_image_bytes = analyzer._prepare_image(image)
-        vision_image = vision.Image(content=prepared_image_bytes)
-
-        # Perform label detection
         with st.spinner("Analyzing image..."):
-            response = client.label_detection(
-                image=vision_image, max_results=max_results
-            )
+            labels = _label_image_cached(image_bytes, max_results, min_score)
 
-        if response.error.message:
-            raise Exception(f"Vision API error: {response.error.message}")
-
-        # Filter and sort labels
-        labels = [
-            label.description
-            for label in response.label_annotations
-            if label.score >= min_score
-        ]
-
-        # Sort by relevance (score)
-        sorted_labels = sorted(
-            response.label_annotations, key=lambda x: x.score, reverse=True
-        )
-
-        result_labels = [
-            label.description for label in sorted_labels if label.score >= min_score
-        ][:max_results]
-
-        logger.info(f"Vision analysis successful: {len(result_labels)} labels found")
-        return result_labels
+        logger.info(f"Vision analysis successful: {len(labels)} labels found")
+        return labels
 
     except Exception as e:
         logger.error(f"Cloud Vision AI Error: {e}")
@@ -374,12 +880,12 @@ def get_image_labels(
         return []
 
 
-def detect_text_in_image(image: Image.Image) -> Optional[str]:
+def detect_text_in_image(image: Union[bytes, Image.Image]) -> Optional[str]:
     """
     Detect and extract text from image using OCR.
 
     Args:
-        image: PIL Image object
+        image: Encoded image bytes, or a PIL Image object
 
     Returns:
         Extracted text or None if failed
@@ -397,8 +903,11 @@ def detect_text_in_image(image: Image.Image) -> Optional[str]:
             logger.error("Failed to initialize Vision API client")
             return None
 
-        # Prepare image
-        image_bytes = analyzer._prepare_image(image)
+        # Prepare image; encoded bytes are only re-encoded if oversized
+        if isinstance(image, Image.Image):
+            image_bytes = analyzer._prepare_image(image)
+        else:
+            image_bytes = analyzer._prepare_image_bytes(image)
         vision_image = vision.Image(content=image_bytes)
 
         # Perform text detection
@@ -446,26 +955,21 @@ def check_gcp_services_health() -> dict:
     if not health_status["credentials"]:
         return health_status
 
-    # Test Speech API
-    try:
-        speech.SpeechClient(credentials=creds_manager.credentials)
-        health_status["speech"] = True
-    except Exception as e:
-        logger.warning(f"Speech API health check failed: {e}")
-
-    # Test Translation API
-    try:
-        translate.Client(credentials=creds_manager.credentials)
-        health_status["translate"] = True
-    except Exception as e:
-        logger.warning(f"Translation API health check failed: {e}")
-
-    # Test Vision API
-    try:
-        vision.ImageAnnotatorClient(credentials=creds_manager.credentials)
-        health_status["vision"] = True
-    except Exception as e:
-        logger.warning(f"Vision API health check failed: {e}")
+    # Bring up the Speech, Translation and Vision clients concurrently
+    client_getters = {
+        "speech": get_speech_client,
+        "translate": get_translate_client,
+        "vision": get_vision_client,
+    }
+    with ThreadPoolExecutor(max_workers=len(client_getters)) as executor:
+        futures = {
+            name: executor.submit(getter) for name, getter in client_getters.items()
+        }
+        for name, future in futures.items():
+            error = future.exception()
+            health_status[name] = error is None
+            if error is not None:
+                logger.warning(f"{name.title()} API health check failed: {error}")
 
     health_status["overall"] = all(
         [health_status["speech"], health_status["translate"], health_status["vision"]]
@@ -1,20 +1,29 @@
 # utils/gdrive_utils.py
 import os
-import json
+import random
+import tempfile
 import streamlit as st
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth import jwt as google_jwt
 from google.auth.transport.requests import Request
 from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
 from googleapiclient.errors import HttpError
+from google_auth_httplib2 import AuthorizedHttp
+import httplib2
 from io import BytesIO
 from PIL import Image
 import logging
-from typing import Dict, Optional, List, Any, Tuple
+from typing import BinaryIO, Dict, Optional, List, Any, Tuple, Union
 import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+import orjson
+
+from utils.image_utils import encode_png
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -28,8 +37,32 @@ SCOPES = [
 ]
 
 ROOT_FOLDER_NAME = "KalaKarigar.ai Exports"
+ROOT_FOLDER_SESSION_KEY = "drive_root_folder_id"
+CREDENTIALS_SESSION_KEY = "drive_credentials_object"
 RETRY_ATTEMPTS = 3
 RETRY_DELAY = 1  # seconds
+RETRY_MAX_DELAY = 30  # seconds
+RETRY_JITTER = 0.5  # seconds of random spread added to backoff
+PNG_COMPRESS_LEVEL = 1  # zlib level for exported images (0-9)
+RESUMABLE_UPLOAD_THRESHOLD = 5 * 1024 * 1024  # Smaller files use one request
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024  # Resumable chunks, multiple of 256KB
+SINGLE_PUT_MAX_SIZE = 16 * 1024 * 1024  # Resumable files sent in one PUT up to this
+IMAGE_SPOOL_MAX_SIZE = 8 * 1024 * 1024  # Encoded images above this spill to disk
+PNG_NATIVE_MODES = ("RGB", "RGBA", "L")
+HTTP_TIMEOUT = 30  # seconds
+
+
+@st.cache_resource(show_spinner=False)
+def _build_flow(client_config_json: str) -> InstalledAppFlow:
+    """
+    Build the OAuth flow once per client configuration.
+
+    Keyed on the serialized config, so changed credentials build a new flow.
+    """
+    client_config = orjson.loads(client_config_json)
+    flow = InstalledAppFlow.from_client_config(client_config, SCOPES)
+    flow.redirect_uri = client_config["web"]["redirect_uris"][0]
+    return flow
 
 
 class GoogleDriveManager:
@@ -37,8 +70,6 @@ class GoogleDriveManager:
 
     def __init__(self):
         self._flow = None
-        self._drive_service = None
-        self._people_service = None
 
     @property
     def flow(self) -> Optional[InstalledAppFlow]:
@@ -52,9 +83,7 @@ class GoogleDriveManager:
         try:
             creds_json_str = os.getenv("GDRIVE_OAUTH_CREDENTIALS")
             if creds_json_str:
-                client_config = json.loads(creds_json_str)
-                # Extract the redirect_uri from the loaded config
-                redirect_uri = client_config["web"]["redirect_uris"][0]
+                return _build_flow(creds_json_str)
             else:
                 # Fallback for local testing
                 flat_creds = st.secrets["gdrive_oauth_credentials"]
@@ -70,68 +99,35 @@ class GoogleDriveManager:
                         "redirect_uris": flat_creds["redirect_uris"],
                     }
                 }
-                redirect_uri = flat_creds["redirect_uris"][0]
-
-            flow = InstalledAppFlow.from_client_config(client_config, SCOPES)
-            flow.redirect_uri = redirect_uri
-
-            return flow
+                return _build_flow(orjson.dumps(client_config).decode())
         except Exception as e:
             st.error(f"Could not configure Google Drive: {e}")
             return None
 
-    def get_drive_service(self) -> Optional[Any]:
-        """Get Drive service with credentials from session."""
-        if not st.session_state.get("gdrive_credentials"):
+    def session_credentials(self) -> Optional[Credentials]:
+        """Load credentials from session, refreshing them if expired."""
+        creds_dict = st.session_state.get("gdrive_credentials")
+        if not creds_dict:
             logger.error("No Google Drive credentials in session")
             return None
 
-        try:
-            creds_dict = st.session_state.gdrive_credentials
+        # Reuse this session's parsed credentials while the token is unchanged
+        creds = st.session_state.get(CREDENTIALS_SESSION_KEY)
+        if creds is None or creds.token != creds_dict.get("token"):
             creds = Credentials.from_authorized_user_info(creds_dict)
 
-            # Check if credentials are valid
-            if not creds.valid:
-                if creds.expired and creds.refresh_token:
-                    creds.refresh(Request())
-                    # Update session with refreshed credentials
-                    st.session_state.gdrive_credentials = {
-                        "token": creds.token,
-                        "refresh_token": creds.refresh_token,
-                        "token_uri": creds.token_uri,
-                        "client_id": creds.client_id,
-                        "client_secret": creds.client_secret,
-                        "scopes": creds.scopes,
-                    }
-                else:
-                    logger.error("Invalid credentials and cannot refresh")
-                    return None
-
-            service = build("drive", "v3", credentials=creds)
-            logger.info("Drive service created successfully")
-            return service
-
-        except Exception as e:
-            logger.error(f"Failed to create Drive service: {e}")
-            return None
-
-    def get_people_service(self) -> Optional[Any]:
-        """Get People service for user info."""
-        if not st.session_state.get("gdrive_credentials"):
-            logger.error("No Google Drive credentials in session")
-            return None
-
-        try:
-            creds_dict = st.session_state.gdrive_credentials
-            creds = Credentials.from_authorized_user_info(creds_dict)
-
-            service = build("people", "v1", credentials=creds)
-            logger.info("People service created successfully")
-            return service
+        # Check if credentials are valid
+        if not creds.valid:
+            if creds.expired and creds.refresh_token:
+                creds.refresh(Request())
+                # Update session with refreshed credentials (and their expiry)
+                st.session_state.gdrive_credentials = orjson.loads(creds.to_json())
+            else:
+                logger.error("Invalid credentials and cannot refresh")
+                return None
 
-        except Exception as e:
-            logger.error(f"Failed to create People service: {e}")
-            return None
+        st.session_state[CREDENTIALS_SESSION_KEY] = creds
+        return creds
 
 
 # Global Drive manager instance
@@ -152,23 +148,90 @@ def get_gdrive_flow() -> Optional[InstalledAppFlow]:
     return manager.flow
 
 
-@st.cache_data(ttl=300)
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _authorized_http(token: str, _creds_info: Dict[str, Any]) -> AuthorizedHttp:
+    """
+    Create the keep-alive transport shared by every client for one access token.
+
+    Credentials stay per token (the manager is process-wide, so they cannot
+    live on it); the Drive and People clients reuse the same open connections.
+    """
+    creds = Credentials.from_authorized_user_info(_creds_info)
+    return AuthorizedHttp(creds, http=httplib2.Http(timeout=HTTP_TIMEOUT))
+
+
+@st.cache_resource(ttl=3600, show_spinner=False)
+def _build_service(
+    api: str, version: str, token: str, _creds_info: Dict[str, Any]
+) -> Any:
+    """
+    Build an API client once per access token.
+
+    Keyed on the token, so a refreshed token builds a fresh client while
+    reruns with the same token reuse the existing one and its connection.
+    """
+    service = build(api, version, http=_authorized_http(token, _creds_info))
+    logger.info(f"{api} service created successfully")
+    return service
+
+
+def _get_cached_service(api: str, version: str) -> Optional[Any]:
+    """Get a shared API client for the session's (refreshed) credentials."""
+    try:
+        creds = get_drive_manager().session_credentials()
+        if creds is None:
+            return None
+        return _build_service(
+            api, version, creds.token, st.session_state.gdrive_credentials
+        )
+    except Exception as e:
+        logger.error(f"Failed to create {api} service: {e}")
+        return None
+
+
 def get_gdrive_service_from_session() -> Optional[Any]:
     """Get Drive service using session credentials with caching."""
-    manager = get_drive_manager()
-    return manager.get_drive_service()
+    return _get_cached_service("drive", "v3")
 
 
-@st.cache_data(ttl=3600)
-def get_user_info() -> Optional[Dict[str, str]]:
+def get_people_service_cached() -> Optional[Any]:
+    """Get People service using session credentials with caching."""
+    return _get_cached_service("people", "v1")
+
+
+def get_user_info(id_token: Optional[str] = None) -> Optional[Dict[str, str]]:
     """
     Fetch user's profile information with caching.
 
+    Args:
+        id_token: ID token just returned by Google's token endpoint during
+            sign-in. It already carries the user's name and email, so the
+            People API is only called when it is missing or lacks them.
+            Never pass a token restored from client-side state: its
+            signature is not checked here.
+
     Returns:
         Dictionary with user name and email or None if failed
     """
-    manager = get_drive_manager()
-    service = manager.get_people_service()
+    creds_dict = st.session_state.get("gdrive_credentials") or {}
+    if id_token:
+        try:
+            # Received directly from the token endpoint over TLS, so the
+            # claims can be read without re-checking the signature
+            claims = google_jwt.decode(id_token, verify=False)
+            if claims.get("name") and claims.get("email"):
+                logger.info(f"Read user info from ID token for: {claims['email']}")
+                return {"name": claims["name"], "email": claims["email"]}
+        except Exception as e:
+            logger.warning(f"Could not read user info from ID token: {e}")
+
+    return _fetch_user_info(creds_dict.get("token"))
+
+
+@st.cache_data(ttl=3600)
+def _fetch_user_info(token: Optional[str]) -> Optional[Dict[str, str]]:
+    """Fetch the profile from the People API, cached per access token."""
+    service = get_people_service_cached()
 
     if not service:
         logger.error("People service not available")
@@ -198,8 +261,32 @@ def get_user_info() -> Optional[Dict[str, str]]:
         return None
 
 
+def _retry_delay(attempt: int, error: Optional[HttpError] = None) -> float:
+    """
+    Get the wait before the next attempt.
+
+    Honors a Retry-After header (in seconds) when the server sends one;
+    otherwise uses jittered exponential backoff so that concurrent workers
+    do not retry in lockstep.
+    """
+    retry_after = error.resp.get("retry-after") if error is not None else None
+    if retry_after:
+        try:
+            return min(float(retry_after), RETRY_MAX_DELAY)
+        except ValueError:
+            pass  # HTTP-date form; fall back to backoff
+
+    delay = RETRY_DELAY * (2**attempt) + random.uniform(0, RETRY_JITTER)
+    return min(delay, RETRY_MAX_DELAY)
+
+
 def retry_operation(func, *args, **kwargs):
-    """Retry operation with exponential backoff."""
+    """
+    Retry operation with exponential backoff.
+
+    ``func`` must perform the network call, e.g. a request's bound
+    ``execute`` method, so that HTTP errors are raised inside the retry.
+    """
     for attempt in range(RETRY_ATTEMPTS):
         try:
             return func(*args, **kwargs)
@@ -209,9 +296,9 @@ def retry_operation(func, *args, **kwargs):
 
             # Check if it's a retryable error
             if e.resp.status in [429, 500, 502, 503, 504]:
-                delay = RETRY_DELAY * (2**attempt)
+                delay = _retry_delay(attempt, e)
                 logger.warning(
-                    f"Retrying operation in {delay}s (attempt {attempt + 1})"
+                    f"Retrying operation in {delay:.1f}s (attempt {attempt + 1})"
                 )
                 time.sleep(delay)
             else:
@@ -219,13 +306,25 @@ def retry_operation(func, *args, **kwargs):
         except Exception as e:
             if attempt == RETRY_ATTEMPTS - 1:
                 raise
-            delay = RETRY_DELAY * (2**attempt)
+            delay = _retry_delay(attempt)
             logger.warning(
-                f"Retrying operation in {delay}s (attempt {attempt + 1}): {e}"
+                f"Retrying operation in {delay:.1f}s (attempt {attempt + 1}): {e}"
             )
             time.sleep(delay)
 
 
+def create_thread_http(service: Any) -> Any:
+    """
+    Create a separate authorized HTTP transport for a worker thread.
+
+    httplib2 connections are not thread-safe, so concurrent requests must not
+    share the service's transport; this one shares only its credentials.
+    """
+    return AuthorizedHttp(
+        service._http.credentials, http=httplib2.Http(timeout=HTTP_TIMEOUT)
+    )
+
+
 class FolderManager:
     """Manages Google Drive folder operations."""
 
@@ -238,11 +337,10 @@ class FolderManager:
             # Search for existing folder
             query = f"name='{ROOT_FOLDER_NAME}' and mimeType='application/vnd.google-apps.folder' and trashed=false"
             response = retry_operation(
-                self.service.files().list,
-                q=query,
-                spaces="drive",
-                fields="files(id, name)",
-            ).execute()
+                self.service.files()
+                .list(q=query, spaces="drive", fields="files(id)", pageSize=1)
+                .execute
+            )
 
             files = response.get("files", [])
 
@@ -259,8 +357,8 @@ class FolderManager:
             }
 
             folder = retry_operation(
-                self.service.files().create, body=folder_metadata, fields="id"
-            ).execute()
+                self.service.files().create(body=folder_metadata, fields="id").execute
+            )
 
             folder_id = folder["id"]
             logger.info(f"Created new root folder: {folder_id}")
@@ -287,10 +385,10 @@ class FolderManager:
             }
 
             folder = retry_operation(
-                self.service.files().create,
-                body=folder_metadata,
-                fields="id, webViewLink",
-            ).execute()
+                self.service.files()
+                .create(body=folder_metadata, fields="id, webViewLink")
+                .execute
+            )
 
             folder_id = folder["id"]
             folder_link = folder["webViewLink"]
@@ -303,38 +401,75 @@ class FolderManager:
             return None, None
 
 
+def create_media_upload(buffer: BinaryIO, mimetype: str) -> MediaIoBaseUpload:
+    """
+    Create a Drive media upload sized to the payload.
+
+    Small files go up in a single multipart request; only files above
+    RESUMABLE_UPLOAD_THRESHOLD pay for a resumable session. Chunks are
+    PUT one after another, so resumable files up to SINGLE_PUT_MAX_SIZE are
+    sent as a single chunk to avoid a round-trip per chunk.
+    """
+    size = buffer.seek(0, os.SEEK_END)
+    buffer.seek(0)
+    if size > RESUMABLE_UPLOAD_THRESHOLD:
+        chunksize = size if size <= SINGLE_PUT_MAX_SIZE else UPLOAD_CHUNK_SIZE
+        return MediaIoBaseUpload(
+            buffer, mimetype=mimetype, resumable=True, chunksize=chunksize
+        )
+    return MediaIoBaseUpload(buffer, mimetype=mimetype, chunksize=-1, resumable=False)
+
+
+def _png_ready(image: Image.Image) -> Image.Image:
+    """
+    Convert an image for PNG export when needed.
+
+    PNG stores RGB, RGBA and L natively; the rest (palette, CMYK, ...) are
+    converted to RGB for web sharing.
+    """
+    if image.mode not in PNG_NATIVE_MODES:
+        return image.convert("RGB")
+    return image
+
+
 class FileUploader:
     """Handles file upload operations to Google Drive."""
 
-    def __init__(self, service):
+    def __init__(self, service, http: Optional[Any] = None):
         self.service = service
+        # Optional per-thread transport (see create_thread_http)
+        self.http = http
 
     def upload_image(
         self,
-        image: Image.Image,
+        image: Union[Image.Image, bytes],
         folder_id: str,
         filename: str = "AI_Enhanced_Image.png",
     ) -> bool:
-        """Upload enhanced image to Drive."""
+        """Upload enhanced image (PIL Image or already encoded PNG bytes) to Drive."""
         try:
-            # Prepare image
-            buffered_image = BytesIO()
+            if isinstance(image, bytes):
+                # Already encoded at generation time, upload as-is
+                buffered_image = BytesIO(image)
+            else:
+                # Encode into a spooled file that spills to disk when large,
+                # rather than holding the whole PNG in memory during upload
+                buffered_image = tempfile.SpooledTemporaryFile(
+                    max_size=IMAGE_SPOOL_MAX_SIZE
+                )
 
-            # Optimize image for web sharing
-            if image.mode != "RGB":
-                image = image.convert("RGB")
+                image = _png_ready(image)
 
-            image.save(buffered_image, format="PNG", optimize=True, quality=95)
+                # compress_level=1 is several times faster than optimize=True
+                # (level 9) for a small size penalty on photographic content
+                image.save(
+                    buffered_image, format="PNG", compress_level=PNG_COMPRESS_LEVEL
+                )
 
-            buffered_image.seek(0)
+                buffered_image.seek(0)
 
             # Create media upload
-            media = MediaIoBaseUpload(
-                buffered_image,
-                mimetype="image/png",
-                resumable=True,
-                chunksize=1024 * 1024,  # 1MB chunks
-            )
+            media = create_media_upload(buffered_image, "image/png")
 
             # File metadata
             file_metadata = {
@@ -345,11 +480,11 @@ class FileUploader:
 
             # Upload with retry
             retry_operation(
-                self.service.files().create,
-                body=file_metadata,
-                media_body=media,
-                fields="id",
-            ).execute()
+                self.service.files()
+                .create(body=file_metadata, media_body=media, fields="id")
+                .execute,
+                http=self.http,
+            )
 
             logger.info(f"Image uploaded successfully: {filename}")
             return True
@@ -375,13 +510,10 @@ Generated by KalaKarigar.ai - Empowering Indian Artisans
 """
 
             # Convert to bytes
-            text_bytes = content_with_header.encode("utf-8")
-            buffered_text = BytesIO(text_bytes)
+            buffered_text = BytesIO(content_with_header.encode("utf-8"))
 
             # Create media upload
-            media = MediaIoBaseUpload(
-                buffered_text, mimetype="text/plain", resumable=True
-            )
+            media = create_media_upload(buffered_text, "text/plain")
 
             # File metadata
             file_metadata = {
@@ -392,11 +524,11 @@ Generated by KalaKarigar.ai - Empowering Indian Artisans
 
             # Upload with retry
             retry_operation(
-                self.service.files().create,
-                body=file_metadata,
-                media_body=media,
-                fields="id",
-            ).execute()
+                self.service.files()
+                .create(body=file_metadata, media_body=media, fields="id")
+                .execute,
+                http=self.http,
+            )
 
             logger.info(f"Text content uploaded successfully: {filename}")
             return True
@@ -414,14 +546,12 @@ Generated by KalaKarigar.ai - Empowering Indian Artisans
         """Upload project metadata as JSON."""
         try:
             # Prepare metadata
-            metadata_content = json.dumps(metadata, indent=2, ensure_ascii=False)
-            metadata_bytes = metadata_content.encode("utf-8")
-            buffered_metadata = BytesIO(metadata_bytes)
+            buffered_metadata = BytesIO(
+                orjson.dumps(metadata, option=orjson.OPT_INDENT_2)
+            )
 
             # Create media upload
-            media = MediaIoBaseUpload(
-                buffered_metadata, mimetype="application/json", resumable=True
-            )
+            media = create_media_upload(buffered_metadata, "application/json")
 
             # File metadata
             file_metadata = {
@@ -432,11 +562,11 @@ Generated by KalaKarigar.ai - Empowering Indian Artisans
 
             # Upload with retry
             retry_operation(
-                self.service.files().create,
-                body=file_metadata,
-                media_body=media,
-                fields="id",
-            ).execute()
+                self.service.files()
+                .create(body=file_metadata, media_body=media, fields="id")
+                .execute,
+                http=self.http,
+            )
 
             logger.info(f"Metadata uploaded successfully: {filename}")
             return True
@@ -448,7 +578,7 @@ Generated by KalaKarigar.ai - Empowering Indian Artisans
 
 def export_marketing_pack(
     service: Any,
-    image: Image.Image,
+    image: Union[Image.Image, bytes],
     text_content: str,
     folder_name: str,
     metadata: Optional[Dict[str, Any]] = None,
@@ -458,7 +588,7 @@ def export_marketing_pack(
 
     Args:
         service: Google Drive service instance
-        image: Enhanced product image
+        image: Enhanced product image, as a PIL Image or encoded PNG bytes
         text_content: Generated marketing content
         folder_name: Base folder name
         metadata: Additional project metadata
@@ -469,11 +599,24 @@ def export_marketing_pack(
     try:
         # Initialize managers
         folder_manager = FolderManager(service)
-        file_uploader = FileUploader(service)
 
-        # Create folder structure
+        # A PIL image is encoded in the background while the folders are
+        # created, so its upload can start as soon as the folder exists
+        encoder = ThreadPoolExecutor(max_workers=1)
+        encoded_image = (
+            encoder.submit(lambda: encode_png(_png_ready(image)))
+            if isinstance(image, Image.Image)
+            else None
+        )
+        encoder.shutdown(wait=False)
+
+        # Create folder structure; the root folder id is remembered for the
+        # session so later exports skip the lookup
+        cached_root_id = st.session_state.get(ROOT_FOLDER_SESSION_KEY)
         with st.spinner("Creating folder structure..."):
-            root_folder_id = folder_manager.find_or_create_root_folder()
+            root_folder_id = (
+                cached_root_id or folder_manager.find_or_create_root_folder()
+            )
             if not root_folder_id:
                 st.error("Failed to create root folder")
                 return None
@@ -482,26 +625,46 @@ def export_marketing_pack(
             project_folder_id, folder_link = folder_manager.create_project_folder(
                 root_folder_id, folder_name
             )
+            if not project_folder_id and cached_root_id:
+                # Cached root may have been deleted; look it up again
+                root_folder_id = folder_manager.find_or_create_root_folder()
+                if root_folder_id:
+                    project_folder_id, folder_link = (
+                        folder_manager.create_project_folder(
+                            root_folder_id, folder_name
+                        )
+                    )
             if not project_folder_id:
+                st.session_state.pop(ROOT_FOLDER_SESSION_KEY, None)
                 st.error("Failed to create project folder")
                 return None
 
-        # Upload files
-        upload_success = []
+        st.session_state[ROOT_FOLDER_SESSION_KEY] = root_folder_id
 
-        with st.spinner("Uploading enhanced image..."):
-            success = file_uploader.upload_image(image, project_folder_id)
-            upload_success.append(success)
+        if encoded_image is not None:
+            image = encoded_image.result()
 
-        with st.spinner("Uploading marketing content..."):
-            success = file_uploader.upload_text_content(text_content, project_folder_id)
-            upload_success.append(success)
+        # Upload files concurrently, each on its own HTTP transport
+        uploads = [
+            (FileUploader.upload_image, image),
+            (FileUploader.upload_text_content, text_content),
+        ]
 
         # Upload metadata if provided
         if metadata:
-            with st.spinner("Uploading project metadata..."):
-                success = file_uploader.upload_metadata(metadata, project_folder_id)
-                upload_success.append(success)
+            uploads.append((FileUploader.upload_metadata, metadata))
+
+        def upload_in_thread(upload, payload):
+            uploader = FileUploader(service, http=create_thread_http(service))
+            return upload(uploader, payload, project_folder_id)
+
+        with st.spinner("Uploading marketing pack files..."):
+            with ThreadPoolExecutor(max_workers=len(uploads)) as executor:
+                futures = [
+                    executor.submit(upload_in_thread, upload, payload)
+                    for upload, payload in uploads
+                ]
+                upload_success = [future.result() for future in futures]
 
         # Check overall success
         if all(upload_success):
@@ -529,7 +692,7 @@ def check_drive_quota(service: Any) -> Optional[Dict[str, Any]]:
         Dictionary with quota information or None if failed
     """
     try:
-        about = service.about().get(fields="storageQuota").execute()
+        about = service.about().get(fields="storageQuota(limit,usage)").execute()
         quota = about.get("storageQuota", {})
 
         total = int(quota.get("limit", 0))
@@ -575,28 +738,41 @@ def check_gdrive_health() -> Dict[str, bool]:
         if not health_status["credentials"]:
             return health_status
 
-        # Check Drive API
-        try:
-            service = get_gdrive_service_from_session()
-            if service:
-                # Test with a simple API call
-                service.about().get(fields="user").execute()
-                health_status["drive_api"] = True
-        except Exception as e:
-            logger.warning(f"Drive API health check failed: {e}")
+        # Services are resolved here; session state is not available from
+        # the worker threads
+        service = get_gdrive_service_from_session()
+        people_service = get_people_service_cached()
+
+        def check_drive() -> bool:
+            try:
+                if service:
+                    # Test with a simple API call
+                    service.about().get(fields="user(emailAddress)").execute(
+                        http=create_thread_http(service)
+                    )
+                    return True
+            except Exception as e:
+                logger.warning(f"Drive API health check failed: {e}")
+            return False
 
-        # Check People API
-        try:
-            manager = get_drive_manager()
-            people_service = manager.get_people_service()
-            if people_service:
-                # Test with a simple API call
-                people_service.people().get(
-                    resourceName="people/me", personFields="names"
-                ).execute()
-                health_status["people_api"] = True
-        except Exception as e:
-            logger.warning(f"People API health check failed: {e}")
+        def check_people() -> bool:
+            try:
+                if people_service:
+                    # Test with a simple API call
+                    people_service.people().get(
+                        resourceName="people/me", personFields="names"
+                    ).execute(http=create_thread_http(people_service))
+                    return True
+            except Exception as e:
+                logger.warning(f"People API health check failed: {e}")
+            return False
+
+        # The two APIs have no shared batch endpoint, so probe them in parallel
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            drive_check = executor.submit(check_drive)
+            people_check = executor.submit(check_people)
+            health_status["drive_api"] = drive_check.result()
+            health_status["people_api"] = people_check.result()
 
         health_status["overall"] = all(
             [
@@ -1,13 +1,19 @@
 # utils/image_utils.py
 import os
+import hashlib
+import math
+import numpy as np
 import streamlit as st
 from PIL import Image, ImageEnhance, ImageFilter
 import google.generativeai as genai
 from io import BytesIO
 import logging
-from typing import Optional, Dict, Tuple, Any
+from typing import Optional, Dict, List, Tuple, Any
 from enum import Enum
 import time
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.cache_utils import ResponseCache
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -15,8 +21,19 @@ logger = logging.getLogger(__name__)
 
 # Constants
 MAX_IMAGE_SIZE = (2048, 2048)
+DOWNSCALE_FILTER = Image.Resampling.BICUBIC  # Gemini re-synthesizes fine detail
 QUALITY_SETTINGS = {"high": 95, "medium": 85, "low": 75}
 FALLBACK_TIMEOUT = 30  # seconds
+IMAGE_MODEL_NAME = "gemini-2.5-flash-image-preview"
+PNG_COMPRESS_LEVEL = 1  # zlib level for cached/exported PNGs (0-9)
+API_IMAGE_MAX_SIDE = 1568  # Gemini/Vision downscale beyond this anyway
+API_IMAGE_QUALITY = QUALITY_SETTINGS["medium"]
+API_IMAGE_MAX_BYTES = 4 * 1024 * 1024  # Larger files are re-encoded even if small
+GENERATION_INPUT_QUALITY = 92  # JPEG quality of images sent for enhancement
+LUMA_WEIGHTS = np.array([0.299, 0.587, 0.114], dtype=np.float32)  # PIL "L"
+FESTIVE_OVERLAY = np.array([255, 220, 180], dtype=np.float32)
+ENHANCED_CACHE_SIZE = 6
+ENHANCED_CACHE_TTL = 1800  # seconds
 
 
 class ImageStyle(Enum):
@@ -47,33 +64,69 @@ class ImageProcessor:
 
         return True
 
+    @staticmethod
+    def flatten_to_rgb(image: Image.Image) -> Image.Image:
+        """Convert to RGB, compositing any transparency onto white."""
+        if image.mode in ("RGBA", "P", "LA"):
+            # Create white background for transparency
+            background = Image.new("RGB", image.size, (255, 255, 255))
+            if image.mode in ("P", "LA"):
+                image = image.convert("RGBA")
+            # getchannel() extracts only the alpha band; split() would
+            # allocate all four
+            background.paste(
+                image,
+                mask=image.getchannel("A") if "A" in image.getbands() else None,
+            )
+            return background
+        if image.mode != "RGB":
+            return image.convert("RGB")
+        return image
+
+    @staticmethod
+    def draft_for_ai(image: Image.Image) -> Image.Image:
+        """
+        Let libjpeg decode a large JPEG at a reduced DCT scale.
+
+        Must be called before the pixels are loaded; the result never drops
+        below the size ``optimize_for_ai`` would thumbnail to. No-op for other
+        formats and for images already within ``MAX_IMAGE_SIZE``.
+        """
+        scale = min(
+            MAX_IMAGE_SIZE[0] / image.size[0], MAX_IMAGE_SIZE[1] / image.size[1]
+        )
+        if image.format == "JPEG" and scale < 1:
+            image.draft(
+                "RGB",
+                (math.ceil(image.size[0] * scale), math.ceil(image.size[1] * scale)),
+            )
+        return image
+
     @staticmethod
     def optimize_for_ai(image: Image.Image) -> Image.Image:
         """Optimize image for AI processing."""
         try:
-            # Create a copy to avoid modifying original
-            optimized = image.copy()
+            # Every step below returns a new image, so the input is not modified
+            optimized = image
 
             # Convert to RGB if needed
-            if optimized.mode in ("RGBA", "P", "LA"):
-                # Create white background for transparency
-                background = Image.new("RGB", optimized.size, (255, 255, 255))
-                if optimized.mode == "P":
-                    optimized = optimized.convert("RGBA")
-                background.paste(
-                    optimized,
-                    mask=optimized.split()[-1] if optimized.mode == "RGBA" else None,
-                )
-                optimized = background
-            elif optimized.mode != "RGB":
-                optimized = optimized.convert("RGB")
+            optimized = ImageProcessor.flatten_to_rgb(optimized)
 
             # Resize if too large
             if (
                 optimized.size[0] > MAX_IMAGE_SIZE[0]
                 or optimized.size[1] > MAX_IMAGE_SIZE[1]
             ):
-                optimized.thumbnail(MAX_IMAGE_SIZE, Image.Resampling.LANCZOS)
+                scale = min(
+                    MAX_IMAGE_SIZE[0] / optimized.size[0],
+                    MAX_IMAGE_SIZE[1] / optimized.size[1],
+                )
+                size = (
+                    max(1, round(optimized.size[0] * scale)),
+                    max(1, round(optimized.size[1] * scale)),
+                )
+                # resize() (unlike in-place thumbnail) needs no defensive copy
+                optimized = optimized.resize(size, DOWNSCALE_FILTER, reducing_gap=2.0)
 
             # Enhance image quality slightly
             enhancer = ImageEnhance.Sharpness(optimized)
@@ -90,37 +143,29 @@ class ImageProcessor:
     def create_fallback_enhancement(image: Image.Image, style: str) -> Image.Image:
         """Create fallback enhancement using PIL when AI fails."""
         try:
-            enhanced = image.copy()
+            # Each style's operations return a new image
+            enhanced = image
 
             if style == ImageStyle.VIBRANT.value:
                 # Increase saturation and contrast
-                enhancer = ImageEnhance.Color(enhanced)
-                enhanced = enhancer.enhance(1.3)
-                enhancer = ImageEnhance.Contrast(enhanced)
-                enhanced = enhancer.enhance(1.2)
-                enhancer = ImageEnhance.Brightness(enhanced)
-                enhanced = enhancer.enhance(1.1)
+                enhanced = ImageProcessor._adjust_tones(
+                    enhanced, color=1.3, contrast=1.2, brightness=1.1
+                )
 
             elif style == ImageStyle.STUDIO.value:
                 # Apply subtle sharpening and brightness adjustment
                 enhanced = enhanced.filter(
                     ImageFilter.UnsharpMask(radius=1, percent=120, threshold=3)
                 )
-                enhancer = ImageEnhance.Brightness(enhanced)
-                enhanced = enhancer.enhance(1.05)
-                enhancer = ImageEnhance.Contrast(enhanced)
-                enhanced = enhancer.enhance(1.1)
+                enhanced = ImageProcessor._adjust_levels(
+                    enhanced, brightness=1.05, contrast=1.1
+                )
 
             elif style == ImageStyle.FESTIVE.value:
-                # Warm tone enhancement
-                enhancer = ImageEnhance.Color(enhanced)
-                enhanced = enhancer.enhance(1.2)
-                enhancer = ImageEnhance.Brightness(enhanced)
-                enhanced = enhancer.enhance(1.15)
-
-                # Apply warm filter effect
-                warm_overlay = Image.new("RGB", enhanced.size, (255, 220, 180))
-                enhanced = Image.blend(enhanced, warm_overlay, 0.1)
+                # Warm tone enhancement with a warm filter effect
+                enhanced = ImageProcessor._adjust_tones(
+                    enhanced, color=1.2, brightness=1.15, warm_overlay=0.1
+                )
 
             logger.info(f"Fallback enhancement applied: {style}")
             return enhanced
@@ -129,46 +174,118 @@ class ImageProcessor:
             logger.error(f"Fallback enhancement failed: {e}")
             return image
 
+    @staticmethod
+    def _adjust_tones(
+        image: Image.Image,
+        color: float = 1.0,
+        contrast: float = 1.0,
+        brightness: float = 1.0,
+        warm_overlay: float = 0.0,
+    ) -> Image.Image:
+        """
+        Apply ImageEnhance-style color, contrast and brightness in one buffer.
+
+        Matches chained ``ImageEnhance`` calls (and an optional blend with the
+        festive warm color) to within a few levels, without allocating an
+        intermediate image per step.
+        """
+        arr = np.asarray(image.convert("RGB"), dtype=np.float32)
+
+        # Color: blend with the per-pixel grayscale
+        gray = (arr @ LUMA_WEIGHTS)[..., None]
+        arr -= gray
+        arr *= color
+        arr += gray
+        np.clip(arr, 0, 255, out=arr)
+
+        # Contrast: blend with the mean gray level
+        if contrast != 1.0:
+            mean = float(np.round((arr @ LUMA_WEIGHTS).mean()))
+            arr -= mean
+            arr *= contrast
+            arr += mean
+            np.clip(arr, 0, 255, out=arr)
+
+        # Brightness: blend with black
+        arr *= brightness
+        np.clip(arr, 0, 255, out=arr)
+
+        if warm_overlay:
+            arr *= 1.0 - warm_overlay
+            arr += FESTIVE_OVERLAY * warm_overlay
+
+        return Image.fromarray(np.rint(arr).astype(np.uint8))
+
+    @staticmethod
+    def _adjust_levels(
+        image: Image.Image, brightness: float = 1.0, contrast: float = 1.0
+    ) -> Image.Image:
+        """
+        Apply ImageEnhance-style brightness then contrast as one lookup table.
+
+        Both are per-level operations; contrast needs only the mean gray level
+        after brightening, which is read from the grayscale histogram.
+        """
+        levels = np.arange(256, dtype=np.float32)
+        bright = np.clip(np.rint(levels * brightness), 0, 255)
+
+        hist = np.asarray(image.convert("L").histogram(), dtype=np.float64)
+        mean = int((hist * bright).sum() / hist.sum() + 0.5)
+
+        table = np.clip(np.rint(mean + (bright - mean) * contrast), 0, 255)
+        return image.point(table.astype(np.uint8).tolist() * len(image.getbands()))
+
+
+STYLE_PROMPTS = {
+    ImageStyle.VIBRANT.value: (
+        "Create a vibrant, professional product photograph with enhanced colors. "
+        "The image should have vivid, saturated colors with high contrast and sharp focus. "
+        "Ensure the lighting brings out all the details and textures. The background should "
+        "complement the product without distracting from it. Make it look premium and eye-catching "
+        "for e-commerce use."
+    ),
+    ImageStyle.STUDIO.value: (
+        "Create a professional studio product shot with clean, minimalist aesthetics. "
+        "Use soft, even lighting against a clean light background (white or light gray). "
+        "The lighting should highlight the craftsmanship details and textures without harsh shadows. "
+        "The result should look elegant, high-end, and suitable for luxury product marketing."
+    ),
+    ImageStyle.FESTIVE.value: (
+        "Create a festive-themed product photograph with warm, celebratory atmosphere. "
+        "Add warm lighting with subtle traditional Indian elements or warm bokeh lights in the background. "
+        "The lighting should be inviting and warm, evoking feelings of celebration like Diwali or weddings. "
+        "Maintain focus on the product while creating a joyful, festive mood."
+    ),
+}
+
+
+@st.cache_resource(show_spinner=False)
+def get_image_model() -> genai.GenerativeModel:
+    """
+    Get the Gemini image model shared across sessions and reruns.
+
+    Raises if the API key is missing so that the failure is not cached.
+    """
+    api_key = st.secrets.get("GEMINI_API_KEY")
+    if not api_key:
+        raise RuntimeError("GEMINI_API_KEY not found in secrets")
+
+    genai.configure(api_key=api_key)
+    return genai.GenerativeModel(IMAGE_MODEL_NAME)
+
 
 class GeminiImageGenerator:
     """Handles Gemini AI image generation with optimizations."""
 
     def __init__(self):
         self._model = None
-        self._style_prompts = {
-            ImageStyle.VIBRANT.value: (
-                "Create a vibrant, professional product photograph with enhanced colors. "
-                "The image should have vivid, saturated colors with high contrast and sharp focus. "
-                "Ensure the lighting brings out all the details and textures. The background should "
-                "complement the product without distracting from it. Make it look premium and eye-catching "
-                "for e-commerce use."
-            ),
-            ImageStyle.STUDIO.value: (
-                "Create a professional studio product shot with clean, minimalist aesthetics. "
-                "Use soft, even lighting against a clean light background (white or light gray). "
-                "The lighting should highlight the craftsmanship details and textures without harsh shadows. "
-                "The result should look elegant, high-end, and suitable for luxury product marketing."
-            ),
-            ImageStyle.FESTIVE.value: (
-                "Create a festive-themed product photograph with warm, celebratory atmosphere. "
-                "Add warm lighting with subtle traditional Indian elements or warm bokeh lights in the background. "
-                "The lighting should be inviting and warm, evoking feelings of celebration like Diwali or weddings. "
-                "Maintain focus on the product while creating a joyful, festive mood."
-            ),
-        }
 
     @property
     def model(self) -> Optional[genai.GenerativeModel]:
         """Get Gemini model with lazy initialization."""
         if self._model is None:
             try:
-                api_key = st.secrets.get("GEMINI_API_KEY")
-                if not api_key:
-                    logger.error("GEMINI_API_KEY not found in secrets")
-                    return None
-
-                genai.configure(api_key=api_key)
-                self._model = genai.GenerativeModel("gemini-2.5-flash-image-preview")
+                self._model = get_image_model()
                 logger.info("Gemini model initialized successfully")
 
             except Exception as e:
@@ -181,67 +298,214 @@ class GeminiImageGenerator:
         self, image: Image.Image, style: str
     ) -> Optional[Image.Image]:
         """Generate enhanced image using Gemini AI."""
+        with st.spinner(f"Applying {style} enhancement with AI..."):
+            return self._request_enhanced_image(image, style)
+
+    def _request_enhanced_image(
+        self, image: Image.Image, style: str
+    ) -> Optional[Image.Image]:
+        """Call Gemini for one style; safe to run from worker threads."""
         if not self.model:
             logger.error("Gemini model not available")
             return None
 
         try:
-            prompt = self._style_prompts.get(
-                style,
-                "Create a high-quality, professional product photograph with enhanced visual appeal.",
-            )
-
             # Generate content with timeout handling
             start_time = time.time()
 
-            with st.spinner(f"Applying {style} enhancement with AI..."):
-                response = self.model.generate_content([prompt, image])
+            response = self.model.generate_content(
+                [self._style_prompt(style), self._image_part(image)]
+            )
 
             elapsed_time = time.time() - start_time
             logger.info(f"AI generation completed in {elapsed_time:.2f} seconds")
 
-            if not response.candidates:
-                logger.warning("No candidates returned from Gemini")
-                return None
-
-            # Process response - use original structure
-            for part in response.candidates[0].content.parts:
-                if part.inline_data and part.inline_data.data:
-                    try:
-                        enhanced_image = Image.open(BytesIO(part.inline_data.data))
-                        logger.info(
-                            f"Successfully generated enhanced image: {enhanced_image.size}"
-                        )
-                        return enhanced_image
-
-                    except Exception as decode_err:
-                        logger.error(f"Failed to decode generated image: {decode_err}")
-
-                elif part.text:
-                    logger.warning(
-                        f"Gemini returned text instead of image: {part.text[:100]}..."
-                    )
-
-            logger.warning("No valid image data found in Gemini response")
-            return None
+            return self._extract_image(response)
 
         except Exception as e:
             logger.error(f"Gemini image generation failed: {e}")
             return None
 
+    @staticmethod
+    def _image_part(image: Image.Image) -> Dict[str, Any]:
+        """
+        Encode image as a JPEG inline data part.
+
+        Passing the PIL image makes the SDK encode it losslessly (WebP), which
+        is far slower and larger for photos.
+        """
+        if image.mode != "RGB":
+            image = image.convert("RGB")
+        with BytesIO() as buffer:
+            image.save(buffer, format="JPEG", quality=GENERATION_INPUT_QUALITY)
+            return {"mime_type": "image/jpeg", "data": buffer.getvalue()}
+
+    def _style_prompt(self, style: str) -> str:
+        """Get the enhancement prompt for a style."""
+        return STYLE_PROMPTS.get(
+            style,
+            "Create a high-quality, professional product photograph with enhanced visual appeal.",
+        )
+
+    def _extract_image(self, response: Any) -> Optional[Image.Image]:
+        """Get the first decodable image from a Gemini response."""
+        if not response.candidates:
+            logger.warning("No candidates returned from Gemini")
+            return None
+
+        # Process response - use original structure
+        for part in response.candidates[0].content.parts:
+            if part.inline_data and part.inline_data.data:
+                try:
+                    enhanced_image = Image.open(BytesIO(part.inline_data.data))
+                    logger.info(
+                        f"Successfully generated enhanced image: {enhanced_image.size}"
+                    )
+                    return enhanced_image
+
+                except Exception as decode_err:
+                    logger.error(f"Failed to decode generated image: {decode_err}")
+
+            elif part.text:
+                logger.warning(
+                    f"Gemini returned text instead of image: {part.text[:100]}..."
+                )
+
+        logger.warning("No valid image data found in Gemini response")
+        return None
+
+
+def compute_image_key(image_bytes: bytes) -> str:
+    """
+    Compute a short content hash used as the cache key for an image.
+
+    Args:
+        image_bytes: Raw image bytes
+
+    Returns:
+        Hex digest identifying the image content
+    """
+    return hashlib.blake2b(image_bytes, digest_size=16).hexdigest()
+
+
+def infer_image_mime(image_bytes: bytes) -> str:
+    """Infer an image MIME type from its magic bytes, defaulting to JPEG."""
+    if image_bytes.startswith(b"\x89PNG"):
+        return "image/png"
+    if image_bytes[:4] == b"RIFF" and image_bytes[8:12] == b"WEBP":
+        return "image/webp"
+    return "image/jpeg"
+
+
+@st.cache_resource(max_entries=2, show_spinner=False)
+def optimize_image(image_key: str, _image_bytes: bytes) -> Image.Image:
+    """
+    Decode and optimize an image for AI processing once per content hash.
+
+    This stage does not depend on the enhancement style, so switching styles
+    on the same upload reuses it.
+
+    Args:
+        image_key: Content hash of the image (see ``compute_image_key``)
+        _image_bytes: Raw image bytes to optimize
+
+    Returns:
+        Optimized PIL Image (shared; callers must not modify it in place)
+    """
+    image = Image.open(BytesIO(_image_bytes))
+    return ImageProcessor.optimize_for_ai(ImageProcessor.draft_for_ai(image))
+
+
+@st.cache_data(max_entries=8, show_spinner=False)
+def _shrink_image_bytes(image_key: str, _image_bytes: bytes, max_side: int) -> bytes:
+    """Downscale and re-encode an image as JPEG, cached per content hash."""
+    with Image.open(BytesIO(_image_bytes)) as image:
+        # Let libjpeg decode at a reduced DCT scale (no-op for other formats)
+        scale = max_side / max(image.size)
+        image.draft(
+            "RGB", (math.ceil(image.width * scale), math.ceil(image.height * scale))
+        )
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        # JPEG has no alpha; transparent areas would otherwise turn black
+        image = ImageProcessor.flatten_to_rgb(image)
+        with BytesIO() as buffer:
+            image.save(buffer, format="JPEG", quality=API_IMAGE_QUALITY)
+            return buffer.getvalue()
+
+
+def shrink_for_api(image_bytes: bytes, max_side: int = API_IMAGE_MAX_SIDE) -> bytes:
+    """
+    Shrink an upload before sending it to Gemini or Vision.
+
+    Images already within ``max_side`` and ``API_IMAGE_MAX_BYTES`` are
+    returned unchanged; only the header is read to decide.
+
+    Args:
+        image_bytes: Raw image bytes
+        max_side: Maximum length of the longer side in pixels
+
+    Returns:
+        JPEG bytes of the downscaled image, or the original bytes
+    """
+    try:
+        with Image.open(BytesIO(image_bytes)) as image:
+            if max(image.size) <= max_side and len(image_bytes) <= API_IMAGE_MAX_BYTES:
+                return image_bytes
+        return _shrink_image_bytes(
+            compute_image_key(image_bytes), image_bytes, max_side
+        )
+    except Exception as e:
+        logger.warning(f"Could not shrink image for API upload: {e}")
+        return image_bytes
+
+
+def encode_png(image: Image.Image) -> bytes:
+    """Encode image as PNG using the fast compression level."""
+    buffer = BytesIO()
+    image.save(buffer, format="PNG", compress_level=PNG_COMPRESS_LEVEL)
+    return buffer.getvalue()
+
+
+@st.cache_resource
+def get_enhanced_image_cache() -> ResponseCache:
+    """Get the enhanced image cache shared across sessions."""
+    return ResponseCache(ENHANCED_CACHE_SIZE, ENHANCED_CACHE_TTL)
 
-@st.cache_data(ttl=300, show_spinner=False)
-def generate_enhanced_image(image_bytes: bytes, style: str) -> Optional[Image.Image]:
+
+def _enhanced_cache_key(image_key: str, style: str) -> str:
+    """Build the enhanced image cache key for one image and style."""
+    return f"{image_key}:{style}"
+
+
+def generate_enhanced_image(
+    image_key: str, style: str, image_bytes: bytes
+) -> Optional[bytes]:
     """
     Generate enhanced image with fallback support and caching.
 
+    AI results are cached per ``image_key`` and ``style`` as PNG bytes, so
+    the image bytes are only decoded on a cache miss. Fallback results are
+    not cached, so a failed AI call is retried on the next request.
+
     Args:
-        image_bytes: Raw image bytes to enhance
+        image_key: Content hash of the image (see ``compute_image_key``)
         style: Enhancement style (Vibrant, Studio, Festive)
+        image_bytes: Raw image bytes to enhance
 
     Returns:
-        Enhanced Image object or None if all methods fail
+        PNG bytes of the enhanced image or None if all methods fail
     """
+    if style not in [s.value for s in ImageStyle]:
+        logger.warning(f"Unknown style '{style}', using Vibrant as fallback")
+        style = ImageStyle.VIBRANT.value
+
+    cache = get_enhanced_image_cache()
+    cache_key = _enhanced_cache_key(image_key, style)
+    cached = cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Enhanced image cache hit ({cache.stats()})")
+        return cached
+
     # Convert bytes back to a PIL Image at the beginning
     image = Image.open(BytesIO(image_bytes))
 
@@ -251,12 +515,8 @@ def generate_enhanced_image(image_bytes: bytes, style: str) -> Optional[Image.Im
         st.error("Invalid image provided for enhancement")
         return None
 
-    if style not in [s.value for s in ImageStyle]:
-        logger.warning(f"Unknown style '{style}', using Vibrant as fallback")
-        style = ImageStyle.VIBRANT.value
-
-    # Optimize image for processing
-    optimized_image = processor.optimize_for_ai(image)
+    # Optimize image for processing (shared across styles)
+    optimized_image = optimize_image(image_key, image_bytes)
 
     # Try AI enhancement first
     generator = GeminiImageGenerator()
@@ -275,7 +535,9 @@ def generate_enhanced_image(image_bytes: bytes, style: str) -> Optional[Image.Im
 
         if enhanced_image:
             logger.info("AI enhancement successful")
-            return enhanced_image
+            enhanced_bytes = encode_png(enhanced_image)
+            cache.set(cache_key, enhanced_bytes)
+            return enhanced_bytes
 
     except Exception as e:
         logger.error(f"AI enhancement failed: {e}")
@@ -291,7 +553,7 @@ def generate_enhanced_image(image_bytes: bytes, style: str) -> Optional[Image.Im
 
         if enhanced_image and enhanced_image != optimized_image:
             st.info("Enhancement applied using fallback method")
-            return enhanced_image
+            return encode_png(enhanced_image)
         else:
             logger.warning("Fallback enhancement produced no changes")
 
@@ -301,11 +563,76 @@ def generate_enhanced_image(image_bytes: bytes, style: str) -> Optional[Image.Im
     # Last resort - return original optimized image
     logger.warning("All enhancement methods failed, returning optimized original")
     st.warning("Enhancement failed, returning optimized original image")
-    return optimized_image
+    return encode_png(optimized_image)
+
+
+def generate_enhanced_images_batch(
+    image_bytes: bytes, styles: List[str]
+) -> Dict[str, Optional[bytes]]:
+    """
+    Generate enhanced images for several styles concurrently.
+
+    Styles already in the enhanced image cache are served from it; only the
+    Gemini calls for the rest run on worker threads. Cache access, spinners
+    and messages all stay on the script thread. Any style whose AI
+    generation fails falls back to PIL enhancement.
+
+    Args:
+        image_bytes: Raw image bytes to enhance
+        styles: Enhancement styles (Vibrant, Studio, Festive)
+
+    Returns:
+        Dictionary mapping each style to PNG bytes (None if the image is invalid)
+    """
+    image_key = compute_image_key(image_bytes)
+    cache = get_enhanced_image_cache()
+    results = {
+        style: cache.get(_enhanced_cache_key(image_key, style)) for style in styles
+    }
+    missing = [style for style, enhanced in results.items() if enhanced is None]
+    if not missing:
+        return results
+
+    image = Image.open(BytesIO(image_bytes))
+
+    processor = ImageProcessor()
+    if not processor.validate_image(image):
+        st.error("Invalid image provided for enhancement")
+        return results
+
+    # Optimize once; every style starts from the same image
+    optimized_image = optimize_image(image_key, image_bytes)
+
+    # Resolve the shared model here, since it comes from the Streamlit cache
+    generator = GeminiImageGenerator()
+    generator.model
+
+    with st.spinner(f"Applying {len(missing)} enhancements with AI..."):
+        with ThreadPoolExecutor(max_workers=len(missing)) as executor:
+            enhanced_images = list(
+                executor.map(
+                    lambda style: generator._request_enhanced_image(
+                        optimized_image, style
+                    ),
+                    missing,
+                )
+            )
+
+    for style, enhanced_image in zip(missing, enhanced_images):
+        if enhanced_image is None:
+            logger.info(f"Using fallback PIL enhancement for {style}")
+            results[style] = encode_png(
+                processor.create_fallback_enhancement(optimized_image, style)
+            )
+        else:
+            results[style] = encode_png(enhanced_image)
+            cache.set(_enhanced_cache_key(image_key, style), results[style])
+
+    return results
 
 
 def save_enhanced_image(
-    image: Image.Image, filename: str, quality: str = "high"
+    image: Image.Image, filename: str, quality: str = "high", for_download: bool = False
 ) -> Optional[BytesIO]:
     """
     Save enhanced image to BytesIO buffer with specified quality.
@@ -314,6 +641,8 @@ def save_enhanced_image(
         image: PIL Image to save
         filename: Base filename (without extension)
         quality: Quality level ('high', 'medium', 'low')
+        for_download: Spend extra CPU on a smaller file (final downloads);
+            interactive saves use the fast settings
 
     Returns:
         BytesIO buffer containing the image or None if failed
@@ -326,12 +655,15 @@ def save_enhanced_image(
         quality_value = QUALITY_SETTINGS.get(quality, QUALITY_SETTINGS["high"])
 
         # Save image
-        save_kwargs = {"format": format_type, "optimize": True}
+        save_kwargs = {"format": format_type}
 
         if format_type == "JPEG":
             save_kwargs["quality"] = quality_value
+            # Second Huffman pass: slower encode for a slightly smaller file
+            save_kwargs["optimize"] = for_download
         elif format_type == "PNG":
-            save_kwargs["compress_level"] = 6  # Good balance of size/speed
+            # Level 6 is a good balance of size/speed for downloads
+            save_kwargs["compress_level"] = 6 if for_download else PNG_COMPRESS_LEVEL
 
         image.save(buffer, **save_kwargs)
         buffer.seek(0)
@@ -366,10 +698,8 @@ def get_image_info(image: Image.Image) -> Dict[str, Any]:
             "megapixels": round((image.size[0] * image.size[1]) / 1_000_000, 2),
         }
 
-        # Add file size estimate
-        buffer = BytesIO()
-        image.save(buffer, format="PNG")
-        info["estimated_size_mb"] = round(len(buffer.getvalue()) / (1024 * 1024), 2)
+        # Add file size estimate (fast compression level, as exported)
+        info["estimated_size_mb"] = round(len(encode_png(image)) / (1024 * 1024), 2)
 
         return info
 
@@ -414,14 +744,11 @@ def validate_enhancement_result(
             if enhanced.mode == "RGB" and original.mode in ("RGBA", "P"):
                 validation["improvements"].append("Optimized for web display")
 
-        # File size estimate
-        orig_buffer = BytesIO()
-        original.save(orig_buffer, format="PNG")
-        orig_size = len(orig_buffer.getvalue())
-
-        enh_buffer = BytesIO()
-        enhanced.save(enh_buffer, format="PNG")
-        enh_size = len(enh_buffer.getvalue())
+        # File size estimate (fast compression level, as exported)
+        orig_png = encode_png(original)
+        enh_png = encode_png(enhanced)
+        orig_size = len(orig_png)
+        enh_size = len(enh_png)
 
         size_ratio = enh_size / orig_size
         if size_ratio < 0.8:
@@ -429,8 +756,10 @@ def validate_enhancement_result(
         elif size_ratio > 2.0:
             validation["warnings"].append("File size significantly increased")
 
-        # Basic quality check
-        if enhanced == original:
+        # Basic quality check; the encodings are identical only when mode,
+        # size and pixels all match, so compare them instead of decoding
+        # both images to raw bytes again
+        if enh_png == orig_png:
             validation["warnings"].append("No visible changes detected")
         else:
             validation["improvements"].append("Visual enhancements applied")
@@ -477,17 +806,14 @@ def check_image_generation_health() -> Dict[str, bool]:
     # Check Gemini model
     if health_status["gemini_api_key"]:
         try:
-            generator = GeminiImageGenerator()
-            health_status["gemini_model"] = generator.model is not None
+            health_status["gemini_model"] = get_image_model() is not None
         except Exception as e:
             logger.warning(f"Gemini model health check failed: {e}")
 
     # Check PIL availability
     try:
         # Test basic PIL operations
-        test_image = Image.new("RGB", (100, 100), "white")
-        processor = ImageProcessor()
-        processor.optimize_for_ai(test_image)
+        Image.new("RGB", (64, 64), "white").resize((32, 32), DOWNSCALE_FILTER)
         health_status["pil_available"] = True
     except Exception as e:
         logger.warning(f"PIL health check failed: {e}")